@@ -5,18 +5,33 @@ MCP server for ESP-IDF development workflow.
 Provides tools for building, flashing, monitoring, and workflow management.
 """
 
-__version__ = "0.2.0"
+import importlib
 
-# Re-export key classes and functions for easier access
-from checkers import BaseChecker, CheckerRegistry, CheckerReport
-from config import Config
-from project import ProjectInfo
-from server import create_server
+__version__ = "0.2.0"
 
-# Core modules
-from tools import ESPTool, ToolRegistry, ToolResult
-from workflow import Stage, StageStatus, Workflow
-from workflow_server import create_workflow_server
+# Re-export key classes and functions for easier access.
+# Names are resolved lazily on first attribute access (PEP 562) so that
+# importing the package does not pull in the MCP server and tool trees.
+_LAZY_EXPORTS = {
+    # Core
+    "ProjectInfo": ("project", "ProjectInfo"),
+    "create_server": ("server", "create_server"),
+    "create_workflow_server": ("workflow_server", "create_workflow_server"),
+    # Tools
+    "ESPTool": ("tools", "ESPTool"),
+    "ToolRegistry": ("tools", "ToolRegistry"),
+    "ToolResult": ("tools", "ToolResult"),
+    # Checkers
+    "BaseChecker": ("checkers", "BaseChecker"),
+    "CheckerRegistry": ("checkers", "CheckerRegistry"),
+    "CheckerReport": ("checkers", "CheckerReport"),
+    # Workflow
+    "Workflow": ("workflow", "Workflow"),
+    "Stage": ("workflow", "Stage"),
+    "StageStatus": ("workflow", "StageStatus"),
+    # Config
+    "Config": ("config", "Config"),
+}
 
 __all__ = [
     "__version__",
@@ -39,3 +54,30 @@ __all__ = [
     # Config
     "Config",
 ]
+
+
+def __getattr__(name: str):
+    """Resolve re-exported names on first access.
+
+    Args:
+        name: Attribute name being looked up on the package.
+
+    Returns:
+        The re-exported object.
+
+    Raises:
+        AttributeError: If name is not a known re-export.
+    """
+    try:
+        module_name, attr = _LAZY_EXPORTS[name]
+    except KeyError:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}") from None
+
+    value = getattr(importlib.import_module(module_name), attr)
+    globals()[name] = value  # Cache so __getattr__ is not hit again
+    return value
+
+
+def __dir__() -> list[str]:
+    """List public names for IDE completion."""
+    return list(__all__)
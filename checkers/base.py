@@ -4,11 +4,19 @@ Provides base classes and utilities for validating workflow stages,
 checking build artifacts, and ensuring project quality.
 """
 
+import functools
+import re
 from abc import ABC, abstractmethod
 from dataclasses import dataclass, field
 from enum import Enum
 from pathlib import Path
 
+# Case-insensitive search avoids allocating a lowercased copy of CMakeLists.txt
+_CMAKE_MIN_REQUIRED_RE = re.compile(r"cmake_minimum_required", re.IGNORECASE)
+
+# Matches the CONFIG_IDF_TARGET line in sdkconfig, capturing the unquoted value
+_TARGET_RE = re.compile(r'^CONFIG_IDF_TARGET="?([^"\r\n]*)"?', re.MULTILINE)
+
 
 class CheckResult(Enum):
     """Result of a checker execution."""
@@ -141,7 +149,7 @@ class CheckerRegistry:
 
     def __init__(self):
         self._checkers: dict[str, type[BaseChecker]] = {}
-        self._stage_map: dict[str, list[str]] = {}
+        self._stage_map: dict[str, list[type[BaseChecker]]] = {}
 
     def register(self, checker_cls: type[BaseChecker]) -> "CheckerRegistry":
         """Register a checker class.
@@ -159,7 +167,7 @@ class CheckerRegistry:
         if stage:
             if stage not in self._stage_map:
                 self._stage_map[stage] = []
-            self._stage_map[stage].append(name)
+            self._stage_map[stage].append(checker_cls)
 
         return self
 
@@ -181,10 +189,10 @@ class CheckerRegistry:
             stage: Workflow stage name.
 
         Returns:
-            List of checker classes for the stage.
+            List of checker classes for the stage. The list is shared with
+            the registry and must not be modified by callers.
         """
-        names = self._stage_map.get(stage, [])
-        return [self._checkers[name] for name in names if name in self._checkers]
+        return self._stage_map.get(stage, [])
 
     def list_all(self) -> list[str]:
         """List all registered checker names."""
@@ -208,7 +216,7 @@ class CheckerRegistry:
                 message=f"Checker '{name}' not found",
             )
 
-        checker = checker_cls(project_root=project_root)
+        checker = checker_cls(project_root=project_root or Path.cwd())
         return checker.check()
 
     def run_stage_checks(self, stage: str, project_root: Path | None = None) -> list[CheckerReport]:
@@ -222,16 +230,59 @@ class CheckerRegistry:
             List of CheckerReport objects.
         """
         checkers = self.get_for_stage(stage)
-        reports = []
-        for checker_cls in checkers:
-            checker = checker_cls(project_root=project_root)
-            reports.append(checker.check())
-        return reports
+        if not checkers:
+            return []
+
+        # Resolve the default once instead of per checker instantiation
+        root = project_root or Path.cwd()
+        return [checker_cls(project_root=root).check() for checker_cls in checkers]
 
 
 # Built-in checkers for ESP-IDF projects
 
 
+@functools.lru_cache(maxsize=32)
+def _scan_cmake(path_str: str, mtime_ns: int, size: int) -> tuple[bool, bool, bool]:
+    """Scan CMakeLists.txt content for ESP-IDF markers.
+
+    Cached on (path, mtime, size) so re-validating an unchanged file
+    skips the read and scan.
+
+    Args:
+        path_str: Path to CMakeLists.txt.
+        mtime_ns: File modification time in nanoseconds (cache key only).
+        size: File size in bytes (cache key only).
+
+    Returns:
+        Tuple of (has_min_required, has_idf_include, has_component_register).
+    """
+    content = Path(path_str).read_text()
+    return (
+        _CMAKE_MIN_REQUIRED_RE.search(content) is not None,
+        "include(ESP-IDF)" in content,
+        "idf_component_register" in content,
+    )
+
+
+@functools.lru_cache(maxsize=32)
+def _scan_sdkconfig_target(path_str: str, mtime_ns: int, size: int) -> str | None:
+    """Extract CONFIG_IDF_TARGET value from sdkconfig.
+
+    Cached on (path, mtime, size) so re-validating an unchanged file
+    skips the read and scan.
+
+    Args:
+        path_str: Path to sdkconfig.
+        mtime_ns: File modification time in nanoseconds (cache key only).
+        size: File size in bytes (cache key only).
+
+    Returns:
+        Configured target chip, or None if not set.
+    """
+    match = _TARGET_RE.search(Path(path_str).read_text())
+    return match.group(1) if match else None
+
+
 class ProjectStructureChecker(BaseChecker):
     """Check if project has valid ESP-IDF structure."""
 
@@ -254,14 +305,17 @@ class ProjectStructureChecker(BaseChecker):
             )
 
         try:
-            content = cmake_path.read_text()
-            if "cmake_minimum_required" not in content.lower():
+            st = cmake_path.stat()
+            has_min_required, has_idf_include, has_component_register = _scan_cmake(
+                str(cmake_path), st.st_mtime_ns, st.st_size
+            )
+            if not has_min_required:
                 return self._fail(
                     message="CMakeLists.txt missing cmake_minimum_required",
                     details="File exists but does not appear to be a valid CMake file",
                 )
 
-            if "include(ESP-IDF)" not in content and "idf_component_register" not in content:
+            if not has_idf_include and not has_component_register:
                 return self._warning(
                     message="CMakeLists.txt may not be an ESP-IDF project file",
                     details="No ESP-IDF include or component registration found",
@@ -297,9 +351,9 @@ class BuildArtifactsChecker(BaseChecker):
                 suggestions=["Run 'idf.py build' first"],
             )
 
-        # Check for firmware binaries
-        bin_files = list(build_dir.glob("**/*.bin"))
-        if not bin_files:
+        # Check for firmware binaries (stop at the first match on the fail path)
+        bin_files = build_dir.rglob("*.bin")
+        if next(bin_files, None) is None:
             return self._fail(
                 message="No firmware binaries found",
                 details=f"No .bin files in {build_dir}",
@@ -308,7 +362,7 @@ class BuildArtifactsChecker(BaseChecker):
 
         return self._pass(
             message="Build artifacts found",
-            details=f"Found {len(bin_files)} .bin files in {build_dir}",
+            details=f"Found {1 + sum(1 for _ in bin_files)} .bin files in {build_dir}",
         )
 
 
@@ -331,15 +385,14 @@ class TargetConfigChecker(BaseChecker):
             )
 
         try:
-            content = sdkconfig.read_text()
+            st = sdkconfig.stat()
             # Look for CONFIG_IDF_TARGET
-            for line in content.splitlines():
-                if line.startswith("CONFIG_IDF_TARGET="):
-                    target = line.split("=")[1].strip('"')
-                    return self._pass(
-                        message=f"Target configured: {target}",
-                        details=f"Found in {sdkconfig}",
-                    )
+            target = _scan_sdkconfig_target(str(sdkconfig), st.st_mtime_ns, st.st_size)
+            if target is not None:
+                return self._pass(
+                    message=f"Target configured: {target}",
+                    details=f"Found in {sdkconfig}",
+                )
 
             return self._warning(
                 message="Target not explicitly set in sdkconfig",
@@ -6,6 +6,50 @@ and MCP server startup.
 
 import sys
 
+USAGE = """usage: espidf-mcp [--http] [--host HOST] [--port PORT]
+
+ESP-IDF MCP Server - run from an ESP-IDF project directory.
+
+options:
+  -h, --help     show this help message and exit
+  --version      show program version and exit
+  --http         serve over HTTP instead of stdio
+  --host HOST    HTTP listening address (default: 127.0.0.1)
+  --port PORT    HTTP listening port (default: 8090)"""
+
+
+def _get_version() -> str:
+    """Get installed package version.
+
+    Returns:
+        Version string, or "unknown" when the package is not installed.
+    """
+    from importlib.metadata import PackageNotFoundError, version
+
+    try:
+        return version("espidf-mcp")
+    except PackageNotFoundError:
+        return "unknown"
+
+
+def _parse_args():
+    """Parse command-line arguments.
+
+    Unknown arguments are ignored; --help and --version are handled
+    by the fast path in main().
+
+    Returns:
+        argparse.Namespace with http, host and port attributes.
+    """
+    import argparse
+
+    parser = argparse.ArgumentParser(prog="espidf-mcp", add_help=False)
+    parser.add_argument("--http", action="store_true")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8090)
+    args, _ = parser.parse_known_args()
+    return args
+
 
 def main() -> None:
     """Main entry point - called by espidf-mcp command.
@@ -19,23 +63,22 @@ def main() -> None:
     Returns:
         None
     """
+    # Fast path: answer --help/--version before importing the server stack
+    if "-h" in sys.argv or "--help" in sys.argv:
+        print(USAGE)
+        return
+    if "--version" in sys.argv:
+        print(f"espidf-mcp {_get_version()}")
+        return
+
     from project import ProjectInfo
     from server import create_server
 
     # Parse command-line arguments
-    host = "127.0.0.1"
-    port = 8090
-    http_mode = "--http" in sys.argv
-
-    if http_mode:
-        if "--port" in sys.argv:
-            port_idx = sys.argv.index("--port")
-            if port_idx + 1 < len(sys.argv):
-                port = int(sys.argv[port_idx + 1])
-        if "--host" in sys.argv:
-            host_idx = sys.argv.index("--host")
-            if host_idx + 1 < len(sys.argv):
-                host = sys.argv[host_idx + 1]
+    args = _parse_args()
+    host = args.host
+    port = args.port
+    http_mode = args.http
 
     # Detect project
     project = ProjectInfo.detect()
@@ -4,6 +4,7 @@ This module defines resource limits to prevent abuse and ensure safe operation
 when called by external agents.
 """
 
+import functools
 from dataclasses import dataclass, field
 from pathlib import Path
 
@@ -30,12 +31,14 @@ class ResourceLimits:
     enable_monitoring: bool = True
 
 
-@dataclass
+@dataclass(frozen=True)
 class ToolTimeouts:
     """Timeout configuration for each tool.
 
     Different tools have different timeout requirements based on their
-    typical execution duration.
+    typical execution duration. Instances are immutable so the lookup table
+    built at construction always matches the fields; use
+    dataclasses.replace() to derive a changed configuration.
 
     Attributes:
         build: Timeout for build operations (10 minutes)
@@ -52,6 +55,24 @@ class ToolTimeouts:
     clean: int = 60
     size: int = 30
     default: int = 60
+    _by_name: dict[str, int] = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        """Build the tool name -> timeout lookup table.
+
+        Both prefixed ("esp_build") and bare ("build") names are included.
+        """
+        timeouts = {
+            "build": self.build,
+            "flash": self.flash,
+            "monitor": self.monitor,
+            "clean": self.clean,
+            "size": self.size,
+        }
+        # Frozen dataclass: set the derived field through object.__setattr__
+        object.__setattr__(
+            self, "_by_name", {**timeouts, **{f"esp_{name}": t for name, t in timeouts.items()}}
+        )
 
     def get_timeout(self, tool_name: str) -> int:
         """Get timeout for a specific tool.
@@ -62,11 +83,7 @@ class ToolTimeouts:
         Returns:
             Timeout in seconds
         """
-        # Remove "esp_" prefix if present
-        name = tool_name.replace("esp_", "")
-
-        # Return specific timeout or default
-        return getattr(self, name, self.default)
+        return self._by_name.get(tool_name, self.default)
 
 
 @dataclass
@@ -103,17 +120,11 @@ def load_config_from_file(config_path: Path) -> SecurityConfig:
     return SecurityConfig()
 
 
-# Default singleton instance
-_default_config: SecurityConfig | None = None
-
-
+@functools.cache
 def get_default_config() -> SecurityConfig:
-    """Get the default security configuration.
+    """Get the default security configuration (thread-safe singleton).
 
     Returns:
         Default SecurityConfig instance
     """
-    global _default_config
-    if _default_config is None:
-        _default_config = SecurityConfig()
-    return _default_config
+    return SecurityConfig()
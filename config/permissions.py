@@ -5,6 +5,7 @@ unauthorized access when called by external agents.
 """
 
 from dataclasses import dataclass
+from functools import cached_property
 from pathlib import Path
 from typing import Literal
 
@@ -104,6 +105,18 @@ class OperationWhitelist:
         self.path_rules = path_rules or self.DEFAULT_PATH_RULES.copy()
         self.strict_mode = strict_mode
 
+        # Expand and resolve rule paths once; project_root and path_rules
+        # do not change after construction. Paths are stored as parts tuples
+        # so containment is a tuple prefix comparison.
+        self._compiled_rules: list[tuple[tuple[str, ...], frozenset[str]]] = [
+            (
+                Path(rule.path_pattern.format(project_root=str(self.project_root))).resolve().parts,
+                frozenset(rule.allowed_operations),
+            )
+            for rule in self.path_rules
+        ]
+        self._project_root_parts = self.project_root.parts
+
     def check_operation(
         self, operation: Literal["read", "write", "delete", "execute"], path: Path
     ) -> bool:
@@ -117,40 +130,29 @@ class OperationWhitelist:
             True if operation is allowed, False otherwise
         """
         try:
-            resolved_path = path.resolve()
+            target_parts = path.resolve().parts
 
             # Check if path is within allowed paths
-            for rule in self.path_rules:
-                # Expand variables in pattern
-                expanded_pattern = rule.path_pattern.format(project_root=str(self.project_root))
-                rule_path = Path(expanded_pattern).resolve()
-
-                # Check if path is within rule path
-                try:
-                    resolved_path.relative_to(rule_path)
+            for rule_parts, allowed_operations in self._compiled_rules:
+                if target_parts[: len(rule_parts)] == rule_parts:
                     # Path is within this rule, check operation
-                    return operation in rule.allowed_operations
-                except ValueError:
-                    # Path is not within this rule
-                    continue
+                    return operation in allowed_operations
 
             # If not in any allowed path, check strict mode
             if self.strict_mode:
                 return False
 
             # In non-strict mode, allow paths within project root
-            try:
-                resolved_path.relative_to(self.project_root)
-                return True
-            except ValueError:
-                return False
+            root_parts = self._project_root_parts
+            return target_parts[: len(root_parts)] == root_parts
 
         except (OSError, ValueError):
             # Invalid path, deny by default
             return False
 
-    def get_allowed_paths_summary(self) -> str:
-        """Get a summary of allowed paths.
+    @cached_property
+    def allowed_paths_summary(self) -> str:
+        """Summary of allowed paths, built once per whitelist.
 
         Returns:
             Formatted string describing allowed paths
@@ -164,6 +166,14 @@ class OperationWhitelist:
             lines.append(f"    Description: {rule.description}")
         return "\n".join(lines)
 
+    def get_allowed_paths_summary(self) -> str:
+        """Get a summary of allowed paths.
+
+        Returns:
+            Formatted string describing allowed paths
+        """
+        return self.allowed_paths_summary
+
 
 # Global whitelist instance (initialized when project is loaded)
 _whitelist: OperationWhitelist | None = None
@@ -9,17 +9,25 @@ Provides common functionality for all tools:
 """
 
 import functools
+import os
 import re
+import shutil
 import subprocess
+import sys
+import threading
 import time
+from collections import deque
 from dataclasses import dataclass
-from typing import Any
+from typing import IO, Any
 
 from mcp.server.fastmcp import FastMCP
 
 # Import exception types
 from .exceptions import ResourceError
 
+# User home path patterns masked by ToolResult._sanitize_details
+_WIN_HOME_RE = re.compile(r"[A-Z]:\\\\Users\\\\[^\\\\]+\\\\", re.IGNORECASE)
+
 # Optional dependencies for resource monitoring
 try:
     import psutil
@@ -28,6 +36,61 @@ try:
 except ImportError:
     HAS_PSUTIL = False
 
+# On Linux, RSS can be read from /proc/self/statm (one line of integers)
+# instead of psutil's multi-field parse of /proc/self/status
+_HAS_PROC_STATM = sys.platform.startswith("linux") and os.path.exists("/proc/self/statm")
+_PAGESIZE = os.sysconf("SC_PAGE_SIZE") if _HAS_PROC_STATM else 0
+
+# Maximum stdout (and stderr) lines retained from a subprocess run; earlier
+# lines are dropped
+_MAX_OUTPUT_LINES = 2000
+
+# Tool calls shorter than this skip the post-execution resource check
+_MIN_RECHECK_SECONDS = 0.1
+
+
+def _fast_rss() -> int:
+    """Read resident set size of the current process from /proc/self/statm.
+
+    Returns:
+        RSS in bytes.
+    """
+    with open("/proc/self/statm", "rb") as f:
+        return int(f.read().split()[1]) * _PAGESIZE
+
+
+def _mask_home_dirs(text: str) -> str:
+    """Replace every ``/home/<user>/`` prefix in text with ``~/``.
+
+    Equivalent to ``re.sub(r"/home/[^/]+/", "~/", text)`` but scans with
+    str.find, which is considerably faster than the regex engine here.
+
+    Args:
+        text: Text that may contain Linux home directory paths.
+
+    Returns:
+        Text with home directory prefixes masked.
+    """
+    parts = []
+    pos = 0  # Start of the not-yet-copied tail
+    search = 0  # Where to look for the next "/home/"
+    while (idx := text.find("/home/", search)) != -1:
+        end = text.find("/", idx + 6)
+        if end == -1:
+            break
+        if end == idx + 6:
+            # "/home//" has an empty user segment; retry one char later
+            search = idx + 1
+            continue
+        parts.append(text[pos:idx])
+        parts.append("~/")
+        pos = search = end + 1
+
+    if not parts:
+        return text
+    parts.append(text[pos:])
+    return "".join(parts)
+
 
 @dataclass
 class ToolResult:
@@ -57,20 +120,19 @@ class ToolResult:
             Formatted response string.
         """
         if self.success:
-            parts = [self.message]
-            if self.duration_seconds > 0:
-                parts.append(f" (duration: {self.duration_seconds:.2f}s)")
-            if self.details:
-                parts.append(f"\n\n{self._sanitize_details(self.details)}")
-            return "".join(parts)
+            head = (
+                f"{self.message} (duration: {self.duration_seconds:.2f}s)"
+                if self.duration_seconds > 0
+                else self.message
+            )
+        elif self.error_code:
+            head = f"[{self.error_code}] Error: {self.message}"
         else:
-            parts = []
-            if self.error_code:
-                parts.append(f"[{self.error_code}] ")
-            parts.append(f"Error: {self.message}")
-            if self.details:
-                parts.append(f"\n\n{self._sanitize_details(self.details)}")
-            return "".join(parts)
+            head = f"Error: {self.message}"
+
+        if self.details:
+            return f"{head}\n\n{self._sanitize_details(self.details)}"
+        return head
 
     @staticmethod
     def _sanitize_details(details: str) -> str:
@@ -84,15 +146,14 @@ class ToolResult:
         Returns:
             Sanitized details string.
         """
-        # Remove user-specific paths (e.g., /home/username/)
-        # Replace with ~/ for clarity
-        sanitized = re.sub(r"/home/[^/]+/", "~/", details)
-        # Also handle Windows paths
-        sanitized = re.sub(r"[A-Z]:\\\\Users\\\\[^\\\\]+\\\\", "~/", sanitized, flags=re.IGNORECASE)
-        # Remove any remaining absolute paths to user home
-        sanitized = re.sub(r"/home/\w+/", "~/", sanitized)
+        # Fast path: most idf.py output has neither pattern's required literal
+        if "/home/" not in details and "\\" not in details:
+            return details
 
-        return sanitized
+        # Replace user-specific paths (e.g., /home/username/, C:\\Users\\name\\) with ~/
+        if "/home/" in details:
+            details = _mask_home_dirs(details)
+        return _WIN_HOME_RE.sub("~/", details)
 
     @classmethod
     def from_subprocess(
@@ -160,6 +221,107 @@ def format_subprocess_result(
     return ToolResult.from_subprocess(result, operation, duration).to_response()
 
 
+def _preview(result: Any, limit: int = 500) -> str:
+    """Return the first ``limit`` characters of a tool result for logging.
+
+    Tools return plain strings, which are sliced directly; other results are
+    converted with str() first.
+    """
+    if not result:
+        return ""
+    if isinstance(result, str):
+        return result[:limit]
+    return str(result)[:limit]
+
+
+def _joined_tail(tail: deque[str], dropped: int) -> str:
+    """Join retained output lines, noting how many earlier lines were dropped.
+
+    Args:
+        tail: Last lines of the output.
+        dropped: Number of lines discarded before them.
+
+    Returns:
+        Output text.
+    """
+    text = "".join(tail)
+    if dropped:
+        return f"... ({dropped} earlier lines omitted)\n{text}"
+    return text
+
+
+def _run_streaming(cmd: list[str], cwd: Any, timeout: float) -> subprocess.CompletedProcess[str]:
+    """Run a command while bounding how much output is kept in memory.
+
+    stdout and stderr are drained by reader threads. Only the last
+    _MAX_OUTPUT_LINES lines of each are retained (a full ESP-IDF build can
+    print megabytes of compiler output, and a failing CMake or compiler run
+    as much to stderr).
+
+    Args:
+        cmd: Command and arguments to execute.
+        cwd: Working directory for the command.
+        timeout: Timeout in seconds.
+
+    Returns:
+        Completed process result with the retained output.
+
+    Raises:
+        subprocess.TimeoutExpired: If the command does not finish in time.
+    """
+    stdout_tail: deque[str] = deque(maxlen=_MAX_OUTPUT_LINES)
+    stderr_tail: deque[str] = deque(maxlen=_MAX_OUTPUT_LINES)
+    # Lines dropped from the stdout and stderr tails
+    dropped = [0, 0]
+
+    def read_tail(stream: IO[str], tail: deque[str], slot: int) -> None:
+        count = 0
+        for line in stream:
+            if len(tail) == _MAX_OUTPUT_LINES:
+                count += 1
+            tail.append(line)
+        dropped[slot] = count
+
+    with subprocess.Popen(
+        cmd,
+        cwd=cwd,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        text=True,
+        errors="replace",
+    ) as proc:
+        readers = [
+            threading.Thread(target=read_tail, args=(proc.stdout, stdout_tail, 0), daemon=True),
+            threading.Thread(target=read_tail, args=(proc.stderr, stderr_tail, 1), daemon=True),
+        ]
+        for reader in readers:
+            reader.start()
+
+        try:
+            returncode = proc.wait(timeout=timeout)
+        except subprocess.TimeoutExpired:
+            proc.kill()
+            proc.wait()
+            for reader in readers:
+                reader.join()
+            raise subprocess.TimeoutExpired(
+                cmd,
+                timeout,
+                output=_joined_tail(stdout_tail, dropped[0]),
+                stderr=_joined_tail(stderr_tail, dropped[1]),
+            ) from None
+
+        for reader in readers:
+            reader.join()
+
+    return subprocess.CompletedProcess(
+        cmd,
+        returncode,
+        _joined_tail(stdout_tail, dropped[0]),
+        _joined_tail(stderr_tail, dropped[1]),
+    )
+
+
 class ResourceMonitor:
     """Monitor resource usage during tool execution.
 
@@ -177,14 +339,15 @@ class ResourceMonitor:
         self.max_execution_time = max_execution_time
         self.start_time: float | None = None
         self.start_memory: int | None = None
+        # Reuse one process handle; constructing it re-stats /proc/self
+        self._proc = psutil.Process() if HAS_PSUTIL else None
 
     def start(self) -> None:
         """Start monitoring resources."""
-        self.start_time = time.time()
-        if HAS_PSUTIL:
+        self.start_time = time.perf_counter()
+        if self._proc is not None:
             try:
-                process = psutil.Process()
-                self.start_memory = process.memory_info().rss
+                self.start_memory = self._current_rss()
             except Exception:
                 self.start_memory = None
 
@@ -197,16 +360,14 @@ class ResourceMonitor:
         Raises:
             ResourceError: If limits are exceeded
         """
-        if not HAS_PSUTIL:
+        if self._proc is None:
             # psutil not available, skip monitoring
             return
 
         try:
-            process = psutil.Process()
-
             # Check execution time
             if self.start_time:
-                elapsed = time.time() - self.start_time
+                elapsed = time.perf_counter() - self.start_time
                 if elapsed > self.max_execution_time:
                     raise ResourceError(
                         f"Tool '{tool_name}' exceeded maximum execution time: "
@@ -214,7 +375,7 @@ class ResourceMonitor:
                     )
 
             # Check memory usage
-            current_memory = process.memory_info().rss
+            current_memory = self._current_rss()
             current_mb = current_memory / (1024 * 1024)
 
             if current_mb > self.max_memory_mb:
@@ -223,10 +384,21 @@ class ResourceMonitor:
                     f"{current_mb:.1f}MB > {self.max_memory_mb}MB"
                 )
 
-        except psutil.Error:
-            # psutil error, log but don't fail
+        except (psutil.Error, OSError):
+            # psutil or /proc read error, log but don't fail
             pass
 
+    def _current_rss(self) -> int:
+        """Get current resident set size of this process.
+
+        Returns:
+            RSS in bytes.
+        """
+        if _HAS_PROC_STATM:
+            return _fast_rss()
+        with self._proc.oneshot():
+            return self._proc.memory_info().rss  # type: ignore[no-any-return]
+
     def get_usage_summary(self) -> dict[str, Any]:
         """Get current resource usage summary.
 
@@ -237,13 +409,12 @@ class ResourceMonitor:
             "monitoring_enabled": HAS_PSUTIL,
         }
 
-        if not HAS_PSUTIL or not self.start_time:
+        if self._proc is None or not self.start_time:
             return summary
 
         try:
-            process = psutil.Process()
-            elapsed = time.time() - self.start_time
-            current_memory = process.memory_info().rss
+            elapsed = time.perf_counter() - self.start_time
+            current_memory = self._current_rss()
 
             summary.update(
                 {
@@ -300,6 +471,9 @@ class BaseTool:
         self.metrics = metrics
         self.security_config = security_config
 
+        # Resolve idf.py once so each subprocess skips the $PATH search
+        self._idf_py = shutil.which("idf.py") or "idf.py"
+
         # Initialize resource monitor if security config is provided
         self.resource_monitor = None
         if security_config and security_config.resource_limits.enable_monitoring:
@@ -319,7 +493,7 @@ class BaseTool:
             Timeout in seconds
         """
         if self.security_config and self.security_config.timeouts:
-            return self.security_config.timeouts.get_timeout(tool_name)  # type: ignore[no-any-return]
+            return self.security_config.timeouts.get_timeout(tool_name)
         return 60  # Default timeout
 
     def _check_resources(self, tool_name: str) -> None:
@@ -334,6 +508,42 @@ class BaseTool:
         if self.resource_monitor:
             self.resource_monitor.check_limits(tool_name)
 
+    def _emit(
+        self,
+        tool_name: str,
+        args: dict[str, Any],
+        result: str,
+        duration: float,
+        success: bool,
+        error: Exception | None = None,
+    ) -> None:
+        """Report a finished tool call to the logger and metrics collector.
+
+        Args:
+            tool_name: Name of the tool.
+            args: Keyword arguments the tool was called with.
+            result: Truncated result (or error message) for the log.
+            duration: Execution duration in seconds.
+            success: Whether the call succeeded.
+            error: Exception raised by the tool, if any.
+        """
+        if self.logger:
+            self.logger.log_tool_call(
+                tool_name=tool_name,
+                args=args,
+                result=result,
+                duration=duration,
+                success=success,
+            )
+        if self.metrics:
+            self.metrics.record_tool_execution(
+                tool_name=tool_name,
+                duration=duration,
+                success=success,
+                error=error,
+                args=args,
+            )
+
     def _log_tool_call(self, func):
         """Decorator to log tool calls and collect metrics.
 
@@ -341,13 +551,16 @@ class BaseTool:
             func: The tool function to wrap.
 
         Returns:
-            Wrapped function with logging and metrics collection.
+            Wrapped function with logging and metrics collection, or func
+            itself when no logger, metrics, or resource monitor is configured.
         """
+        if not (self.logger or self.metrics or self.resource_monitor):
+            return func
 
         @functools.wraps(func)
         def wrapper(*args, **kwargs):
             tool_name = func.__name__
-            start_time = time.time()
+            start_ns = time.perf_counter_ns()
 
             try:
                 # Start resource monitoring
@@ -359,81 +572,20 @@ class BaseTool:
 
                 # Execute the tool function
                 result = func(*args, **kwargs)
-                duration = time.time() - start_time
+                duration = (time.perf_counter_ns() - start_ns) / 1e9
 
-                # Final resource check after execution
-                self._check_resources(tool_name)
-
-                # Log successful tool call
-                if self.logger:
-                    self.logger.log_tool_call(
-                        tool_name=tool_name,
-                        args=kwargs,
-                        result=str(result)[:500] if result else "",
-                        duration=duration,
-                        success=True,
-                    )
-
-                # Record metrics
-                if self.metrics:
-                    self.metrics.record_tool_execution(
-                        tool_name=tool_name,
-                        duration=duration,
-                        success=True,
-                        args=kwargs,
-                    )
+                # Final resource check after execution (skipped for fast tools,
+                # which cannot have moved far from the pre-execution check)
+                if duration > _MIN_RECHECK_SECONDS:
+                    self._check_resources(tool_name)
 
+                self._emit(tool_name, kwargs, _preview(result), duration, success=True)
                 return result
 
-            except ResourceError as e:
-                duration = time.time() - start_time
-
-                # Log resource limit violation
-                if self.logger:
-                    self.logger.log_tool_call(
-                        tool_name=tool_name,
-                        args=kwargs,
-                        result=str(e)[:500],
-                        duration=duration,
-                        success=False,
-                    )
-
-                # Record metrics for resource limit violation
-                if self.metrics:
-                    self.metrics.record_tool_execution(
-                        tool_name=tool_name,
-                        duration=duration,
-                        success=False,
-                        error=e,
-                        error_type="ResourceError",
-                        args=kwargs,
-                    )
-
-                raise
-
             except Exception as e:
-                duration = time.time() - start_time
-
-                # Log failed tool call
-                if self.logger:
-                    self.logger.log_tool_call(
-                        tool_name=tool_name,
-                        args=kwargs,
-                        result=str(e)[:500],
-                        duration=duration,
-                        success=False,
-                    )
-
-                # Record metrics for failure
-                if self.metrics:
-                    self.metrics.record_tool_execution(
-                        tool_name=tool_name,
-                        duration=duration,
-                        success=False,
-                        error=e,
-                        args=kwargs,
-                    )
-
+                # Covers ResourceError raised by the resource checks as well
+                duration = (time.perf_counter_ns() - start_ns) / 1e9
+                self._emit(tool_name, kwargs, str(e)[:500], duration, success=False, error=e)
                 raise
 
         return wrapper
@@ -470,10 +622,15 @@ class BaseTool:
             if configured_timeout != 60:
                 timeout = configured_timeout
 
+        if cmd and cmd[0] == "idf.py":
+            cmd = [self._idf_py, *cmd[1:]]
+
+        if capture_output:
+            return _run_streaming(cmd, cwd=self.project.root, timeout=timeout)
+
         return subprocess.run(
             cmd,
             cwd=self.project.root,
-            capture_output=capture_output,
             text=True,
             timeout=timeout,
         )
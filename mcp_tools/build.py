@@ -7,10 +7,27 @@ Provides build-related functionality:
 - Setting target chip
 """
 
+import os
 import time
 from typing import Literal
 
-from .base import BaseTool, format_subprocess_result
+from .base import BaseTool, ToolResult, format_subprocess_result
+from .exceptions import BuildRequiredError
+
+# Target chips accepted by esp_set_target
+_VALID_TARGETS: frozenset[str] = frozenset(
+    {
+        "esp32",
+        "esp32s2",
+        "esp32c3",
+        "esp32s3",
+        "esp32c2",
+        "esp32h2",
+        "esp32p4",
+        "esp32c6",
+        "esp32c5",
+    }
+)
 
 
 class BuildTools(BaseTool):
@@ -18,6 +35,8 @@ class BuildTools(BaseTool):
 
     def register_tools(self) -> None:
         """Register all build tools with the MCP server."""
+        # Project root is fixed for the server lifetime
+        build_dir = self.project.root / "build"
 
         @self.mcp.tool()
         @self._log_tool_call
@@ -52,20 +71,24 @@ class BuildTools(BaseTool):
                 Call: esp_build()
                 Returns: "Build succeeded (duration: 5.20s)..."
             """
-            start_time = time.time()
+            start_time = time.perf_counter()
             result = self._run_command(
                 ["idf.py", "build"],
                 timeout=600,  # 10 minutes for build
             )
-            duration = time.time() - start_time
+            duration = time.perf_counter() - start_time
 
             # Save output to workflow state if available
             if self.workflow is not None:
                 # Collect artifacts
                 artifacts = []
-                build_dir = self.project.root / "build"
                 if build_dir.exists():
-                    artifacts = [str(f) for f in build_dir.glob("*.bin")]
+                    with os.scandir(build_dir) as entries:
+                        artifacts = [
+                            entry.path
+                            for entry in entries
+                            if entry.name.endswith(".bin") and entry.is_file(follow_symlinks=False)
+                        ]
 
                 self.workflow.save_stage_output(
                     stage_name="build",
@@ -145,10 +168,6 @@ class BuildTools(BaseTool):
                 Call: esp_size()
                 Returns: "Firmware size analysis\n\nTotal sizes:\nText: 180816 bytes..."
             """
-            from .exceptions import BuildRequiredError
-
-            build_dir = self.project.root / "build"
-
             # Verify prerequisites
             if not build_dir.exists():
                 raise BuildRequiredError(
@@ -161,8 +180,6 @@ class BuildTools(BaseTool):
             )
             # For size analysis, we want to show the output even on success
             if result.returncode == 0:
-                from .base import ToolResult
-
                 return ToolResult(
                     success=True,
                     message="Firmware size analysis",
@@ -226,21 +243,9 @@ class BuildTools(BaseTool):
             EXAMPLE:
                 Call: esp_set_target(target="esp32s3")
             """
-            from .base import ToolResult
-
-            # Runtime validation for defense in depth
-            valid_targets = {
-                "esp32",
-                "esp32s2",
-                "esp32c3",
-                "esp32s3",
-                "esp32c2",
-                "esp32h2",
-                "esp32p4",
-                "esp32c6",
-                "esp32c5",
-            }
-            if target not in valid_targets:
+            # Runtime validation for defense in depth. Every whitelisted target
+            # is alphanumeric, so no separate character check is needed.
+            if target not in _VALID_TARGETS:
                 return ToolResult(
                     success=False,
                     message="Invalid target",
@@ -248,15 +253,6 @@ class BuildTools(BaseTool):
                     error_code="INVALID_TARGET",
                 ).to_response()
 
-            # Ensure target only contains safe characters (alphanumeric and underscore)
-            if not target.replace("_", "").isalnum():
-                return ToolResult(
-                    success=False,
-                    message="Invalid target format",
-                    details=f"Target '{target}' contains invalid characters. Target must be alphanumeric.",
-                    error_code="INVALID_FORMAT",
-                ).to_response()
-
             result = self._run_command(
                 ["idf.py", "set-target", target],
                 timeout=60,
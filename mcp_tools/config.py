@@ -8,6 +8,8 @@ Provides configuration-related functionality:
 
 from .base import BaseTool, ToolResult, format_subprocess_result
 
+_VALIDATION_PASSED = "Partition table validation passed"
+
 
 class ConfigTools(BaseTool):
     """Configuration-related tools for ESP-IDF development."""
@@ -46,11 +48,16 @@ class ConfigTools(BaseTool):
                 _, message = self.project.validate()
                 return f"Error: Current directory is not a valid ESP-IDF project\n\n{message}"
 
+            # Stat each file once
+            cmake_ok = self.project.cmake_path.exists()
+            sdk_ok = self.project.sdkconfig_path.exists()
+            root = self.project.root
+
             output = [
-                f"Project directory: {self.project.root}",
-                f"CMakeLists.txt: {'exists' if self.project.cmake_path.exists() else 'not found'}",
-                f"sdkconfig: {'exists' if self.project.sdkconfig_path.exists() else 'not found'}",
-                f"Current working directory: {self.project.root}",
+                f"Project directory: {root}",
+                f"CMakeLists.txt: {'exists' if cmake_ok else 'not found'}",
+                f"sdkconfig: {'exists' if sdk_ok else 'not found'}",
+                f"Current working directory: {root}",
             ]
             return "\n".join(output)
 
@@ -115,6 +122,6 @@ class ConfigTools(BaseTool):
                 timeout=30,
             )
             if result.returncode == 0:
-                return "Partition table validation passed"
+                return _VALIDATION_PASSED
             else:
                 return format_subprocess_result(result, "Partition table validation")
@@ -4,6 +4,9 @@ Provides specific exception types for better error handling and reporting.
 Allows external agents to catch and handle specific error scenarios.
 """
 
+import functools
+from collections.abc import Callable
+
 
 class ESPIDFError(Exception):
     """Base exception for all ESP-IDF MCP Server errors.
@@ -24,9 +27,22 @@ class ESPIDFError(Exception):
             message: Human-readable error description.
             details: Additional error context.
         """
-        self.message = message
-        self.details = details
-        super().__init__(self._format_message())
+        # message and details live in self.args, which also keeps pickling
+        # intact; the "message: details" string is only built by str()
+        super().__init__(message, details)
+
+    @property
+    def message(self) -> str:
+        """Human-readable error description."""
+        return self.args[0]  # type: ignore[no-any-return]
+
+    @property
+    def details(self) -> str | None:
+        """Additional error context."""
+        return self.args[1]  # type: ignore[no-any-return]
+
+    def __str__(self) -> str:
+        return self._format_message()
 
     def _format_message(self) -> str:
         """Format error message with details."""
@@ -212,6 +228,8 @@ class BuildRequiredError(PrerequisiteError):
         fix_command: 修复命令
     """
 
+    fix_command = "idf.py build"
+
     def __init__(self, build_dir: str, details: str | None = None):
         """Initialize build required error.
 
@@ -219,28 +237,85 @@ class BuildRequiredError(PrerequisiteError):
             build_dir: 缺失的构建目录路径
             details: 额外详情
         """
-        self.build_dir = build_dir
-        self.fix_command = "idf.py build"
-        super().__init__(f"Build required: {build_dir} not found", details)
+        # args mirror the constructor signature; the message is derived lazily
+        super().__init__(build_dir, details)
+
+    @property
+    def build_dir(self) -> str:
+        """Missing build directory path."""
+        return self.args[0]  # type: ignore[no-any-return]
+
+    @property
+    def message(self) -> str:
+        """Human-readable error description."""
+        return f"Build required: {self.build_dir} not found"
 
 
 # Map error types to user-friendly descriptions
-ERROR_DESCRIPTIONS = {
-    "EnvironmentError": "ESP-IDF environment configuration issue",
-    "BuildError": "Firmware build compilation/linking error",
-    "ConfigurationError": "Project or tool configuration error",
-    "HardwareError": "Hardware connection or operation error",
-    "FlashError": "Firmware flashing operation error",
-    "MonitorError": "Serial monitor operation error",
-    "PermissionError": "Permission or security policy violation",
-    "ResourceError": "Resource limit exceeded",
-    "ValidationError": "Input or output validation failure",
-    "WorkflowError": "Workflow state or execution error",
-    "PrerequisiteError": "Prerequisite condition not met",
-    "BuildRequiredError": "Build artifacts required but not found",
+ERROR_DESCRIPTIONS: dict[type, str] = {
+    EnvironmentError: "ESP-IDF environment configuration issue",
+    BuildError: "Firmware build compilation/linking error",
+    ConfigurationError: "Project or tool configuration error",
+    HardwareError: "Hardware connection or operation error",
+    FlashError: "Firmware flashing operation error",
+    MonitorError: "Serial monitor operation error",
+    PermissionError: "Permission or security policy violation",
+    ResourceError: "Resource limit exceeded",
+    ValidationError: "Input or output validation failure",
+    WorkflowError: "Workflow state or execution error",
+    PrerequisiteError: "Prerequisite condition not met",
+    BuildRequiredError: "Build artifacts required but not found",
 }
 
 
+def _build_suggestion(error: Exception) -> str:
+    """Suggest a fix for a BuildError, special-casing memory overflows."""
+    if "memory" in str(error).lower():
+        return "Reduce code size or adjust partition table"
+    return "Check source code and configuration"
+
+
+def _build_required_suggestion(error: Exception) -> str:
+    """Suggest the fix command carried by a BuildRequiredError."""
+    return f"Build firmware first: {error.fix_command}"  # type: ignore[attr-defined]
+
+
+# Map exact error types to suggestion handlers. Types missing from this table
+# fall back to the nearest ancestor in their MRO (e.g. FlashError subclasses).
+_SUGGESTION_HANDLERS: dict[type, Callable[[Exception], str]] = {
+    EnvironmentError: lambda e: "Check ESP-IDF environment: source ~/esp/esp-idf/export.sh",
+    BuildError: _build_suggestion,
+    FlashError: lambda e: "Check device is in download mode, try lower baud rate",
+    MonitorError: lambda e: "Check port is not in use, verify baud rate",
+    HardwareError: lambda e: "Check USB connection and device power",
+    PermissionError: lambda e: "Check file permissions and operation whitelist",
+    ResourceError: lambda e: "Reduce resource usage or adjust limits",
+    ConfigurationError: lambda e: "Run 'idf.py menuconfig' to fix configuration",
+    ValidationError: lambda e: "Check input parameters and try again",
+    WorkflowError: lambda e: "Check workflow state and stage dependencies",
+    BuildRequiredError: _build_required_suggestion,
+    PrerequisiteError: lambda e: "Check prerequisites and fix missing dependencies",
+}
+
+
+@functools.lru_cache(maxsize=64)
+def _inherited_description(error_type: type) -> str:
+    """Resolve the description of the nearest described ancestor of error_type."""
+    for cls in error_type.__mro__[1:]:
+        if cls in ERROR_DESCRIPTIONS:
+            return ERROR_DESCRIPTIONS[cls]
+    return "Unknown error type"
+
+
+@functools.lru_cache(maxsize=64)
+def _inherited_suggestion_handler(error_type: type) -> Callable[[Exception], str] | None:
+    """Resolve the suggestion handler of the nearest registered ancestor of error_type."""
+    for cls in error_type.__mro__[1:]:
+        if cls in _SUGGESTION_HANDLERS:
+            return _SUGGESTION_HANDLERS[cls]
+    return None
+
+
 def get_error_description(error: Exception) -> str:
     """Get user-friendly description for an error.
 
@@ -257,8 +332,10 @@ def get_error_description(error: Exception) -> str:
         ...     print(get_error_description(e))
         Firmware build compilation/linking error
     """
-    error_type = type(error).__name__
-    return ERROR_DESCRIPTIONS.get(error_type, "Unknown error type")
+    description = ERROR_DESCRIPTIONS.get(type(error))
+    if description is None:
+        description = _inherited_description(type(error))
+    return description
 
 
 def get_error_suggestion(error: Exception) -> str | None:
@@ -277,46 +354,9 @@ def get_error_suggestion(error: Exception) -> str | None:
         ...     print(get_error_suggestion(e))
         Source the ESP-IDF export script: source ~/esp/esp-idf/export.sh
     """
-    if isinstance(error, EnvironmentError):
-        return "Check ESP-IDF environment: source ~/esp/esp-idf/export.sh"
-
-    if isinstance(error, BuildError):
-        if "memory" in str(error).lower():
-            return "Reduce code size or adjust partition table"
-        return "Check source code and configuration"
-
-    # Check specific hardware error types before generic HardwareError
-    # because FlashError and MonitorError are subclasses of HardwareError
-    if isinstance(error, FlashError):
-        return "Check device is in download mode, try lower baud rate"
-
-    if isinstance(error, MonitorError):
-        return "Check port is not in use, verify baud rate"
-
-    if isinstance(error, HardwareError):
-        return "Check USB connection and device power"
-
-    if isinstance(error, PermissionError):
-        return "Check file permissions and operation whitelist"
-
-    if isinstance(error, ResourceError):
-        return "Reduce resource usage or adjust limits"
-
-    if isinstance(error, ConfigurationError):
-        return "Run 'idf.py menuconfig' to fix configuration"
-
-    if isinstance(error, ValidationError):
-        return "Check input parameters and try again"
-
-    if isinstance(error, WorkflowError):
-        return "Check workflow state and stage dependencies"
-
-    # Prerequisite errors should come after specific error types
-    # since BuildRequiredError is a subclass of PrerequisiteError
-    if isinstance(error, BuildRequiredError):
-        return f"Build firmware first: {error.fix_command}"
-
-    if isinstance(error, PrerequisiteError):
-        return "Check prerequisites and fix missing dependencies"
-
-    return None
+    handler = _SUGGESTION_HANDLERS.get(type(error))
+    if handler is None:
+        handler = _inherited_suggestion_handler(type(error))
+        if handler is None:
+            return None
+    return handler(error)
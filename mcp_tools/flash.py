@@ -8,11 +8,58 @@ Provides flash-related functionality:
 """
 
 import asyncio
+from collections import deque
 
 import serial
-import serial.tools.list_ports
 
 from .base import BaseTool, ToolResult, format_subprocess_result
+from .exceptions import BuildRequiredError
+
+# Fixed command prefixes; per-call arguments are appended when building argv
+_IDF_FLASH_CMD = ("idf.py", "flash")
+_IDF_ERASE_REGION_CMD = ("idf.py", "erase-region")
+_ESPTOOL_CMD = ("esptool.py",)
+
+# Separator shown under the monitor header and each progress reminder
+_SEPARATOR = "=" * 50
+
+
+def _read_available(ser: serial.Serial) -> bytes:
+    """Read everything currently buffered on a serial port.
+
+    Blocks for up to the port timeout waiting for the first byte, then drains
+    the rest of the input buffer in a single read.
+
+    Args:
+        ser: Open serial port.
+
+    Returns:
+        Bytes read (empty on timeout).
+    """
+    data = ser.read(1)
+    if data and (waiting := ser.in_waiting):
+        data += ser.read(waiting)
+    return data
+
+
+def _decode_line(line: bytes) -> str:
+    """Decode one serial line (without its trailing newline) for display.
+
+    ESP-IDF terminates log lines with CRLF, so the common case only needs the
+    trailing carriage return sliced off. Leading whitespace is preserved since
+    it carries log indentation.
+
+    Args:
+        line: Raw line bytes, already split on b"\\n".
+
+    Returns:
+        Decoded line, or an empty string for blank lines.
+    """
+    if line.endswith(b"\r"):
+        decoded = line[:-1].decode("utf-8", errors="ignore")
+    else:
+        decoded = line.decode("utf-8", errors="ignore").rstrip()
+    return "" if decoded.isspace() else decoded
 
 
 class FlashTools(BaseTool):
@@ -59,8 +106,6 @@ class FlashTools(BaseTool):
             EXAMPLE:
                 Call: esp_flash(port="/dev/ttyUSB0")
             """
-            from .exceptions import BuildRequiredError
-
             build_dir = self.project.root / "build"
 
             # Verify prerequisites
@@ -70,25 +115,23 @@ class FlashTools(BaseTool):
                     details="esp_flash requires firmware to be built first",
                 )
 
-            # Verify firmware binaries exist
-            bin_files = list(build_dir.glob("**/*.bin"))
-            if not bin_files:
+            # Verify firmware binaries exist; stop at the first one found
+            if next(build_dir.rglob("*.bin"), None) is None:
                 raise BuildRequiredError(
                     build_dir=str(build_dir),
                     details="No firmware binaries found to flash",
                 )
 
-            cmd = ["idf.py", "flash"]
-            if port:
-                cmd.extend(["-p", port])
-            cmd.extend(["-b", str(baud)])
+            cmd = [*_IDF_FLASH_CMD, *(("-p", port) if port else ()), "-b", str(baud)]
 
             result = self._run_command(cmd, timeout=300)  # 5 minutes
             return format_subprocess_result(result, "Flash")
 
         @self.mcp.tool()
         @self._log_tool_call
-        async def esp_monitor(port: str, baud: int = 115200, seconds: int = 60) -> str:
+        async def esp_monitor(
+            port: str, baud: int = 115200, seconds: int = 60, max_lines: int = 10_000
+        ) -> str:
             """Monitor ESP32 serial output in real-time.
 
             PURPOSE:
@@ -108,6 +151,10 @@ class FlashTools(BaseTool):
                 seconds (int): Monitoring duration in seconds
                     - Default: 60
                     - Required: No
+                max_lines (int): Maximum output lines to return
+                    - Default: 10000
+                    - Older lines are dropped first
+                    - Required: No
 
             RETURNS:
                 str: Serial output content with progress updates
@@ -119,50 +166,80 @@ class FlashTools(BaseTool):
             EXAMPLE:
                 Call: esp_monitor(port="/dev/ttyUSB0", seconds=30)
             """
+            if max_lines < 1:
+                return "Monitor failed: max_lines must be at least 1"
+
             ser = None
+            read: asyncio.Future[bytes] | None = None
             try:
                 ser = serial.Serial(port, baudrate=baud, timeout=1)
                 ser.reset_input_buffer()
 
-                output = []
-                start_time = asyncio.get_event_loop().time()
+                # Ring buffer of output entries: long sessions keep only the
+                # most recent max_lines instead of growing without bound
+                output: deque[str] = deque(maxlen=max_lines)
+                write = output.append
+                appended = 0
+                loop = asyncio.get_running_loop()
+                start_time = loop.time()
+                deadline = start_time + seconds
                 line_count = 0
                 last_reminder = 0
+                pending = b""  # Partial line carried over between reads
 
-                output.append(f"Starting monitor on {port} (baud: {baud})")
-                output.append("=" * 50)
-
-                while asyncio.get_event_loop().time() - start_time < seconds:
-                    elapsed = int(asyncio.get_event_loop().time() - start_time)
+                while (now := loop.time()) < deadline:
+                    elapsed = int(now - start_time)
 
                     # Remind every 20 seconds
                     if elapsed - last_reminder >= 20:
                         remaining = seconds - elapsed
-                        output.append(f"\nRunning for {elapsed}s, {remaining}s remaining")
-                        output.append("=" * 50)
+                        write(f"\nRunning for {elapsed}s, {remaining}s remaining\n{_SEPARATOR}")
+                        appended += 1
                         last_reminder = elapsed
 
-                    if ser.in_waiting > 0:
-                        try:
-                            data = ser.readline()
-                            if data:
-                                decoded = data.decode("utf-8", errors="ignore").strip()
+                    # Block in a worker thread until data arrives or the read
+                    # times out, then split everything received into lines.
+                    # The timeout never runs past the deadline, and the read
+                    # is shielded so a cancelled call can still wait for it
+                    try:
+                        ser.timeout = min(1.0, deadline - now)
+                        read = asyncio.ensure_future(asyncio.to_thread(_read_available, ser))
+                        data = await asyncio.shield(read)
+                        if data:
+                            *lines, pending = (pending + data).split(b"\n")
+                            for line in lines:
+                                decoded = _decode_line(line)
                                 if decoded:
-                                    output.append(decoded)
+                                    write(decoded)
+                                    appended += 1
                                     line_count += 1
-                        except (serial.SerialException, UnicodeDecodeError):
-                            pass
-                    await asyncio.sleep(0.05)  # 50ms poll interval
-
-                elapsed = int(asyncio.get_event_loop().time() - start_time)
-                output.append(f"\nMonitoring ended (ran {elapsed}s, {line_count} lines)")
-                return "\n".join(output)
+                    except (serial.SerialException, UnicodeDecodeError):
+                        await asyncio.sleep(0.05)  # Back off before retrying the port
+
+                # Keep an unterminated final line
+                decoded = _decode_line(pending)
+                if decoded:
+                    write(decoded)
+                    appended += 1
+                    line_count += 1
+
+                elapsed = int(loop.time() - start_time)
+                header = [f"Starting monitor on {port} (baud: {baud})", _SEPARATOR]
+                if appended > max_lines:
+                    header.append(f"[truncated: kept last {max_lines} of {appended} output lines]")
+                footer = f"\nMonitoring ended (ran {elapsed}s, {line_count} lines)"
+                return "\n".join([*header, *output, footer])
 
             except serial.SerialException as e:
                 return f"Serial error: {e}"
             except Exception as e:
                 return f"Monitor failed: {e}"
             finally:
+                if read is not None and not read.done():
+                    # Cancelled mid-read: unblock the worker and let it finish
+                    # before the port is closed underneath it
+                    ser.cancel_read()
+                    await asyncio.wait((read,))
                 if ser and ser.is_open:
                     ser.close()
 
@@ -192,10 +269,7 @@ class FlashTools(BaseTool):
             EXAMPLE:
                 Call: esp_read_mac(port="/dev/ttyUSB0")
             """
-            cmd = ["esptool.py"]
-            if port:
-                cmd.extend(["--port", port])
-            cmd.append("read_mac")
+            cmd = [*_ESPTOOL_CMD, *(("--port", port) if port else ()), "read_mac"]
 
             result = self._run_command(cmd, timeout=60)
 
@@ -238,9 +312,7 @@ class FlashTools(BaseTool):
             EXAMPLE:
                 Call: esp_erase_region(address="0x9000", size=4096)
             """
-            cmd = ["idf.py", "erase-region", address, str(size)]
-            if port:
-                cmd.extend(["-p", port])
+            cmd = [*_IDF_ERASE_REGION_CMD, address, str(size), *(("-p", port) if port else ())]
 
             result = self._run_command(cmd, timeout=180)  # 3 minutes
 
@@ -276,10 +348,10 @@ class FlashTools(BaseTool):
                 Call: esp_list_ports()
                 Returns: "1. /dev/ttyUSB0 - CP2102N USB to UART Bridge Controller\n2. ..."
             """
-            ports = serial.tools.list_ports.comports()
+            # Imported on first use; port enumeration is rarely needed at startup
+            from serial.tools import list_ports
+
+            ports = list_ports.comports()
             if not ports:
                 return "No serial devices detected"
-            output = []
-            for i, port in enumerate(ports, 1):
-                output.append(f"{i}. {port.device} - {port.description}")
-            return "\n".join(output)
+            return "\n".join([f"{i}. {p.device} - {p.description}" for i, p in enumerate(ports, 1)])
@@ -8,6 +8,15 @@ Provides monitoring and workflow state functionality:
 
 from .base import BaseTool
 
+# Stages reported by esp_workflow_files, in workflow order
+_WORKFLOW_STAGE_NAMES = ("init", "config", "build", "flash", "monitor")
+
+# Static report headers
+_SEP40 = "=" * 40
+_SEP50 = "=" * 50
+_STATE_HEADER = ("ESP-IDF MCP Workflow State", _SEP40)
+_FILES_HEADER = ("ESP-IDF MCP File-Based Workflow State", _SEP50)
+
 
 class MonitorTools(BaseTool):
     """Monitoring and workflow state tools for ESP-IDF development."""
@@ -48,10 +57,10 @@ class MonitorTools(BaseTool):
 
             progress = self.workflow.get_progress()
             stages = self.workflow.list_stages()
+            stage_outputs = self.workflow.get_all_stage_outputs()
 
             output = [
-                "ESP-IDF MCP Workflow State",
-                "=" * 40,
+                *_STATE_HEADER,
                 f"Progress: {progress['progress_percent']:.1f}%",
                 f"Completed: {progress['completed']}/{progress['total_stages']}",
                 f"Current: {progress.get('current', 'None')}",
@@ -64,10 +73,12 @@ class MonitorTools(BaseTool):
                 deps = f" (deps: {', '.join(stage.depends_on)})" if stage.depends_on else ""
 
                 # Get file status
-                stage_output = self.workflow.get_stage_output(stage.name)
+                stage_output = stage_outputs.get(stage.name)
                 file_info = ""
                 if stage_output:
-                    file_info = f" [file: {stage_output.timestamp.split('T')[1][:8]}]"
+                    file_info = (
+                        f" [file: {stage_output.timestamp[11:19]}]"  # HH:MM:SS of ISO timestamp
+                    )
 
                 output.append(f"  [{status}]{file_info} {stage.name}{deps}")
 
@@ -102,8 +113,7 @@ class MonitorTools(BaseTool):
                 return "Workflow state management is disabled."
 
             output = [
-                "ESP-IDF MCP File-Based Workflow State",
-                "=" * 50,
+                *_FILES_HEADER,
                 f"Project: {self.project.root}",
                 f"State Directory: {self.workflow.file_manager.mcp_dir}",
                 "",
@@ -123,8 +133,9 @@ class MonitorTools(BaseTool):
                 ]
             )
 
-            for stage_name in ["init", "config", "build", "flash", "monitor"]:
-                stage_status = self.workflow.get_stage_output(stage_name)
+            stage_outputs = self.workflow.get_all_stage_outputs()
+            for stage_name in _WORKFLOW_STAGE_NAMES:
+                stage_status = stage_outputs.get(stage_name)
                 if stage_status:
                     icon = "✓" if stage_status.success else "✗"
                     output.append(
@@ -18,87 +18,127 @@ Example:
     metrics.record_tool_execution("build", 5.2, True)
 """
 
-from functools import cache
+import threading
 from pathlib import Path
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from .diagnostics import DiagnosticEngine
+    from .logger import MCPLogger
+    from .metrics import MetricsCollector
+
+# Defaults resolved once at import (the server does not change directory)
+_DEFAULT_PROJECT_ROOT = Path.cwd()
+_DEFAULT_LOG_DIR = _DEFAULT_PROJECT_ROOT / ".espidf-mcp" / "logs"
+
+# Singleton instances, keyed by the arguments that created them. Lookups are
+# plain dict reads; the lock is only taken when an instance has to be built.
+_loggers: dict[tuple, "MCPLogger"] = {}
+_metrics: dict[Path, "MetricsCollector"] = {}
+_diagnostics: "DiagnosticEngine | None" = None
+_lock = threading.Lock()
 
 
-@cache
 def get_logger(
     name: str,
     log_dir: Path | None = None,
     console_enabled: bool = True,
     json_enabled: bool = True,
 ) -> "MCPLogger":
-    """Get or create logger instance (thread-safe, Python 3.9+).
+    """Get or create logger instance (thread-safe).
 
-    Uses functools.lru_cache for thread-safe singleton pattern.
     The same parameters will always return the same instance.
 
     Args:
         name: Logger name (e.g., "espidf_mcp", "workflow").
-        log_dir: Directory for log files. Defaults to .espidf-mcp/logs/.
+        log_dir: Directory for log files. Defaults to .espidf-mcp/logs/ under
+            the working directory at import time.
         console_enabled: Enable colored console output.
         json_enabled: Enable JSON structured logging.
 
     Returns:
         MCPLogger instance.
-
-    Note:
-        In Python 3.9+, lru_cache is thread-safe and provides
-        better performance than manual double-checked locking.
     """
-    from .logger import MCPLogger
-
     if log_dir is None:
-        log_dir = Path.cwd() / ".espidf-mcp" / "logs"
+        log_dir = _DEFAULT_LOG_DIR
+    key = (name, log_dir, console_enabled, json_enabled)
+    logger = _loggers.get(key)
+    if logger is not None:
+        return logger
 
-    return MCPLogger(
-        name=name,
-        log_dir=log_dir,
-        console_enabled=console_enabled,
-        json_enabled=json_enabled,
-    )
+    from .logger import MCPLogger
+
+    with _lock:
+        logger = _loggers.get(key)
+        if logger is None:
+            logger = MCPLogger(
+                name=name,
+                log_dir=log_dir,
+                console_enabled=console_enabled,
+                json_enabled=json_enabled,
+            )
+            _loggers[key] = logger
+    return logger
 
 
-@cache
 def get_metrics(project_root: Path | None = None) -> "MetricsCollector":
     """Get or create metrics collector instance (thread-safe).
 
     Args:
-        project_root: Project root directory. Defaults to cwd.
+        project_root: Project root directory. Defaults to the working
+            directory at import time.
 
     Returns:
         MetricsCollector instance.
     """
-    from .metrics import MetricsCollector
-
     if project_root is None:
-        project_root = Path.cwd()
+        project_root = _DEFAULT_PROJECT_ROOT
+    metrics = _metrics.get(project_root)
+    if metrics is not None:
+        return metrics
 
-    return MetricsCollector(project_root)
+    from .metrics import MetricsCollector
+
+    with _lock:
+        metrics = _metrics.get(project_root)
+        if metrics is None:
+            metrics = MetricsCollector(project_root)
+            _metrics[project_root] = metrics
+    return metrics
 
 
-@cache
 def get_diagnostics() -> "DiagnosticEngine":
     """Get or create diagnostic engine instance (thread-safe).
 
+    The engine is shared process-wide so its pattern matchers are built once.
+    Patterns added with add_custom_pattern() therefore apply to every caller;
+    create a separate DiagnosticEngine for private patterns.
+
     Returns:
         DiagnosticEngine instance with built-in error patterns.
     """
+    global _diagnostics
+    if _diagnostics is not None:
+        return _diagnostics
+
     from .diagnostics import DiagnosticEngine
 
-    return DiagnosticEngine()
+    with _lock:
+        if _diagnostics is None:
+            _diagnostics = DiagnosticEngine()
+    return _diagnostics
 
 
 def reset() -> None:
     """Reset all singleton instances.
 
     Used primarily for testing to ensure clean state.
-    Clears the lru_cache for all singleton functions.
     """
-    get_logger.cache_clear()
-    get_metrics.cache_clear()
-    get_diagnostics.cache_clear()
+    global _diagnostics
+    with _lock:
+        _loggers.clear()
+        _metrics.clear()
+        _diagnostics = None
 
 
 __all__ = [
@@ -3,12 +3,203 @@
 Provides intelligent error analysis and fix recommendations for ESP-IDF development.
 """
 
+import hashlib
 import re
-from dataclasses import dataclass
+import threading
+from collections import OrderedDict
+from collections.abc import Callable, Iterable, Iterator
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field, replace
+from datetime import datetime
+from itertools import repeat
 from pathlib import Path
+from typing import Any
 
+# Optional Aho-Corasick automaton for the multi-literal prefilter
+try:
+    import ahocorasick
 
-@dataclass
+    HAS_AHOCORASICK = True
+except ImportError:
+    HAS_AHOCORASICK = False
+
+# Optional regex module; unlike re it can release the GIL while matching,
+# which diagnose_parallel() relies on
+try:
+    import regex
+
+    HAS_REGEX = True
+except ImportError:
+    HAS_REGEX = False
+
+# Severity ranking; diagnose() reports the highest-ranked matched severity
+_SEVERITY_LEVELS = {"info": 0, "warning": 1, "error": 2}
+_SEVERITY_NAMES = ("info", "warning", "error")
+
+# Categories in the order diagnose() prefers them when several match;
+# any other category ranks below all of these
+CATEGORY_PRIORITY = ("environment", "build", "flash", "hardware", "config")
+_CATEGORY_PRIORITY = {category: rank for rank, category in enumerate(CATEGORY_PRIORITY)}
+_UNRANKED_CATEGORY = len(_CATEGORY_PRIORITY)
+
+# Default size of the error output tail that diagnose() analyses
+MAX_DIAGNOSE_BYTES = 65536
+
+# Smallest error output diagnose_parallel() spreads across threads
+PARALLEL_MIN_CHARS = 32_000
+
+# Size of each engine's diagnose_parallel() thread pool; larger worker
+# counts are capped to it
+_PARALLEL_MAX_WORKERS = 8
+
+# diagnose() result cache: entry count and largest error output cached
+_CACHE_SIZE = 256
+_CACHE_MAX_INPUT = 64 * 1024
+
+# Environment variable names whose values DiagnosticContext redacts
+_SENSITIVE_RE = re.compile(r"TOKEN|PASSWORD|SECRET|KEY|AUTH|CREDENTIAL", re.IGNORECASE)
+
+# Numbered backreference (\1, \2, ...) inside a regex pattern string
+_BACKREF_RE = re.compile(r"\\[1-9]")
+
+
+def _cache_key(text: str) -> bytes:
+    """Digest identifying an error output in the diagnose() cache.
+
+    Args:
+        text: Error output.
+
+    Returns:
+        16-byte BLAKE2b digest of text.
+    """
+    return hashlib.blake2b(text.encode("utf-8", "surrogatepass"), digest_size=16).digest()
+
+
+def _required_literal(pattern: str) -> str | None:
+    """Extract a literal substring that every match of pattern must contain.
+
+    Scans the pattern for runs of plain (or escaped punctuation) characters
+    and returns the longest one, lowercased. Characters made optional by a
+    following ``?``, ``*`` or ``{`` are excluded. Patterns using alternation
+    or groups are not analysed.
+
+    Args:
+        pattern: Regex pattern string.
+
+    Returns:
+        Lowercased required literal, or None if none could be determined.
+    """
+    if "|" in pattern or "(" in pattern:
+        return None
+
+    runs: list[str] = []
+    current: list[str] = []
+    i = 0
+    n = len(pattern)
+    while i < n:
+        char = pattern[i]
+        literal = None
+        if char == "\\":
+            if i + 1 < n and not pattern[i + 1].isalnum():
+                literal = pattern[i + 1]
+            i += 2
+        elif char == "[":
+            # Skip the character class (a leading "]" is part of the class)
+            i += 2 if pattern[i + 1 : i + 2] == "]" else 1
+            while i < n and pattern[i] != "]":
+                i += 2 if pattern[i] == "\\" else 1
+            i += 1
+        elif char in ".^$)]{}*+?":
+            i += 1
+        else:
+            literal = char
+            i += 1
+
+        if literal is not None and literal.isascii():
+            following = pattern[i : i + 1]
+            if following in ("?", "*", "{"):
+                runs.append("".join(current))
+                current = []
+            else:
+                current.append(literal)
+                if following == "+":
+                    runs.append("".join(current))
+                    current = []
+        else:
+            runs.append("".join(current))
+            current = []
+            if char == "{":
+                # Skip the rest of a {m,n} quantifier
+                while i < n and pattern[i - 1] != "}":
+                    i += 1
+    runs.append("".join(current))
+
+    longest = max(runs, key=len)
+    return longest.lower() if longest else None
+
+
+def _lowercase_pattern(pattern: str) -> str | None:
+    """Rewrite a case-insensitive pattern to match lowercased text exactly.
+
+    Letters outside escape sequences are lowercased, so the result compiled
+    without re.IGNORECASE matches error_output.lower() wherever the original
+    compiled with re.IGNORECASE matches error_output (for ASCII text).
+    Escapes such as \\S keep their case.
+
+    Args:
+        pattern: Regex pattern string.
+
+    Returns:
+        Lowercased pattern, or None if it cannot be lowercased safely (non-ASCII
+        patterns, inline flags, character-code escapes, or class ranges with a
+        single uppercase endpoint such as [0-Z]).
+    """
+    if not pattern.isascii():
+        return None
+
+    out: list[str] = []
+    in_class = False
+    class_start = 0
+    i = 0
+    n = len(pattern)
+    while i < n:
+        char = pattern[i]
+        if char == "\\":
+            if pattern[i + 1 : i + 2] in ("x", "u", "U", "N", "0"):
+                return None
+            out.append(pattern[i : i + 2])
+            i += 2
+            continue
+        if in_class:
+            if char == "]" and i > class_start:
+                in_class = False
+            elif char == "-" and i > class_start and pattern[i + 1 : i + 2] not in ("]", ""):
+                # Range: lowercasing is only safe if both ends are A-Z letters
+                low, high = pattern[i - 1], pattern[i + 1]
+                if low.isupper() != high.isupper():
+                    return None
+        elif char == "[":
+            in_class = True
+            # A leading "^" and a "]" or "-" right after it are not class syntax
+            class_start = i + 2 if pattern[i + 1 : i + 2] == "^" else i + 1
+        elif char == "(" and pattern[i + 1 : i + 2] == "?":
+            flag = pattern[i + 2 : i + 3]
+            if flag == "P":
+                # Keep (?P<name> and (?P=name) verbatim
+                end = pattern.find(">" if pattern[i + 3 : i + 4] == "<" else ")", i)
+                if end == -1:
+                    return None
+                out.append(pattern[i : end + 1])
+                i = end + 1
+                continue
+            if flag == "-" or flag.isalpha():
+                return None
+        out.append(char.lower())
+        i += 1
+    return "".join(out)
+
+
+@dataclass(slots=True)
 class ErrorPattern:
     """Error pattern definition for matching and diagnostics.
 
@@ -18,6 +209,7 @@ class ErrorPattern:
         category: Error category (environment, build, flash, hardware, etc).
         suggestions: List of actionable fix suggestions.
         severity: Error severity level (error, warning, info).
+        case_sensitive: Match the patterns case-sensitively.
     """
 
     name: str
@@ -25,6 +217,58 @@ class ErrorPattern:
     category: str
     suggestions: list[str]
     severity: str = "error"
+    case_sensitive: bool = False
+    _compiled: list[re.Pattern[str]] = field(init=False, repr=False, compare=False)
+    _union: re.Pattern[str] | None = field(init=False, repr=False, compare=False)
+    _lower_union: re.Pattern[str] | None = field(init=False, repr=False, compare=False)
+    _literals: tuple[str, ...] | None = field(init=False, repr=False, compare=False)
+    _severity_int: int = field(init=False, repr=False, compare=False)
+    _category_priority: int = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        """Compile the regex patterns once, skipping invalid ones.
+
+        Valid patterns are also combined into a single alternation so that
+        matching is one search() call; if they cannot be combined safely,
+        the per-pattern list is used. Unless the pattern is case-sensitive, a
+        lowercased alternation compiled without re.IGNORECASE is built too, for
+        matching against pre-lowercased ASCII text.
+        """
+        self._severity_int = _SEVERITY_LEVELS.get(self.severity, 0)
+        self._category_priority = _CATEGORY_PRIORITY.get(self.category, _UNRANKED_CATEGORY)
+
+        flags = 0 if self.case_sensitive else re.IGNORECASE
+        self._compiled = []
+        valid = []
+        for pattern in self.patterns:
+            try:
+                self._compiled.append(re.compile(pattern, flags))
+            except re.error:
+                # Invalid regex, skip
+                continue
+            valid.append(pattern)
+
+        # Prefilter: at least one of these must occur for any subpattern to
+        # match. Only usable when every subpattern has a required literal.
+        literals = [_required_literal(p) for p in valid]
+        self._literals = None if None in literals else tuple(literals)  # type: ignore[arg-type]
+
+        # Numbered backreferences would point at the wrong group once the
+        # patterns are combined, so keep those on the per-pattern path
+        self._union = None
+        self._lower_union = None
+        if valid and not any(_BACKREF_RE.search(p) for p in valid):
+            try:
+                self._union = re.compile("|".join(f"(?:{p})" for p in valid), flags)
+            except re.error:
+                pass
+
+        lowered = [_lowercase_pattern(p) for p in valid]
+        if self._union is not None and not self.case_sensitive and None not in lowered:
+            try:
+                self._lower_union = re.compile("|".join(f"(?:{p})" for p in lowered))  # type: ignore[misc]
+            except re.error:
+                pass
 
     def matches(self, error_output: str) -> bool:
         """Check if error output matches any pattern.
@@ -35,17 +279,98 @@ class ErrorPattern:
         Returns:
             True if any pattern matches.
         """
-        for pattern in self.patterns:
-            try:
-                if re.search(pattern, error_output, re.IGNORECASE):
-                    return True
-            except re.error:
-                # Invalid regex, skip
-                continue
-        return False
+        if self._union is not None:
+            return self._union.search(error_output) is not None
+        return any(compiled.search(error_output) for compiled in self._compiled)
+
+    def matches_fast(self, error_output: str, lowered: str | None) -> bool:
+        """Check for a match, screening with substring tests first.
+
+        Args:
+            error_output: Error text to match against.
+            lowered: error_output.lower() if error_output is ASCII, else None
+                (non-ASCII case folding differs between str.lower and re).
+
+        Returns:
+            True if any pattern matches.
+        """
+        if (
+            lowered is not None
+            and self._literals is not None
+            and not any(literal in lowered for literal in self._literals)
+        ):
+            return False
+        if lowered is not None and self._lower_union is not None:
+            return self._lower_union.search(lowered) is not None
+        return self.matches(error_output)
+
+
+def _parallel_searcher(pattern: ErrorPattern) -> Callable[[str], bool]:
+    """Build a GIL-releasing search function for diagnose_parallel().
+
+    Args:
+        pattern: ErrorPattern to search for.
+
+    Returns:
+        Function returning whether pattern matches a string. Falls back to
+        pattern.matches if a subpattern is not valid regex-module syntax.
+    """
+    flags = 0 if pattern.case_sensitive else regex.IGNORECASE
+    try:
+        compiled = [regex.compile(c.pattern, flags) for c in pattern._compiled]
+    except regex.error:
+        return pattern.matches
+    return lambda text: any(c.search(text, concurrent=True) for c in compiled)
+
+
+def _build_automaton(patterns: tuple[ErrorPattern, ...]) -> tuple[Any, frozenset[int]]:
+    """Build an Aho-Corasick automaton over every pattern's required literals.
+
+    Each literal maps to the indices of the patterns requiring it; patterns
+    without a full literal set are always candidates.
+
+    Args:
+        patterns: Patterns to index.
+
+    Returns:
+        (automaton, indices of patterns without literals). The automaton is
+        None when pyahocorasick is not installed or no pattern has literals.
+    """
+    if not HAS_AHOCORASICK:
+        return None, frozenset()
+
+    owners: dict[str, list[int]] = {}
+    unfiltered = set()
+    for i, pattern in enumerate(patterns):
+        if pattern._literals is None:
+            unfiltered.add(i)
+            continue
+        for literal in pattern._literals:
+            owners.setdefault(literal, []).append(i)
+
+    if not owners:
+        return None, frozenset(unfiltered)
+    automaton = ahocorasick.Automaton()
+    for literal, indices in owners.items():
+        automaton.add_word(literal, tuple(indices))
+    automaton.make_automaton()
+    return automaton, frozenset(unfiltered)
 
 
-@dataclass
+def _search_chunk(jobs: list[tuple[int, Callable[[str], bool]]], text: str) -> list[int]:
+    """Run one worker's share of diagnose_parallel() searches.
+
+    Args:
+        jobs: (pattern index, search function) pairs.
+        text: Error output to search.
+
+    Returns:
+        Indices of the patterns that matched.
+    """
+    return [i for i, search in jobs if search(text)]
+
+
+@dataclass(slots=True)
 class DiagnosticResult:
     """Result of error diagnosis.
 
@@ -81,7 +406,9 @@ class DiagnosticEngine:
     actionable fix suggestions.
 
     Example:
-        diagnostics = get_diagnostics()
+        from observability import get_diagnostics
+
+        diagnostics = get_diagnostics()  # Process-wide shared engine
 
         # Diagnose error
         result = diagnostics.diagnose("IDF_PATH not set")
@@ -339,82 +666,318 @@ class DiagnosticEngine:
         ),
     ]
 
+    # Snapshot of PATTERNS with its literal automaton, shared by every engine
+    # without custom patterns (see _build_matchers)
+    _shared_matchers: tuple[Any, ...] | None = None
+
     def __init__(self, custom_patterns: list[ErrorPattern] | None = None):
         """Initialize diagnostic engine with built-in patterns.
 
         Args:
             custom_patterns: Additional custom patterns to add.
         """
-        self.patterns = list(self.PATTERNS)
+        self.patterns = self.PATTERNS.copy()
+        # (patterns snapshot, literal automaton, unfiltered indices), built
+        # lazily by _sync_matchers and replaced as a whole
+        self._matchers: tuple[tuple[ErrorPattern, ...], Any, frozenset[int]] | None = None
+        # Digest of error_output -> result, see diagnose()
+        self._cache: OrderedDict[bytes, DiagnosticResult] = OrderedDict()
+        self._cache_lock = threading.Lock()
+        # Patterns snapshot with one search function per pattern, and the
+        # worker pool, created lazily by diagnose_parallel() under the lock
+        self._parallel_searchers: (
+            tuple[tuple[ErrorPattern, ...], list[Callable[[str], bool]]] | None
+        ) = None
+        self._parallel_pool: ThreadPoolExecutor | None = None
+        self._parallel_lock = threading.Lock()
 
         if custom_patterns:
             for pattern in custom_patterns:
                 self.add_custom_pattern(pattern)
 
-    def diagnose(self, error_output: str, context: dict | None = None) -> DiagnosticResult:
+    def diagnose(
+        self,
+        error_output: str,
+        context: dict | None = None,
+        stop_early: bool = False,
+        max_bytes: int | None = MAX_DIAGNOSE_BYTES,
+    ) -> DiagnosticResult:
         """Analyze error output and return diagnostic report.
 
+        Results for recurring error outputs are served from a small cache,
+        which is cleared whenever self.patterns changes.
+
         Args:
             error_output: Error text to analyze.
             context: Optional additional context (command, args, etc).
+                Calls with a context bypass the cache.
+            stop_early: Stop matching once further matches cannot change the
+                category, severity or confidence (an environment error plus
+                three more matches). matched_patterns and suggestions may then
+                be incomplete. Such calls bypass the cache.
+            max_bytes: Only the last max_bytes characters of error_output are
+                analysed (compile/link errors and tracebacks sit at the end of
+                a log). None analyses the whole output.
+
+        Returns:
+            DiagnosticResult with matched patterns and suggestions.
+        """
+        if max_bytes is not None and len(error_output) > max_bytes:
+            error_output = error_output[-max_bytes:]
+        matchers = self._sync_matchers()
+
+        cacheable = context is None and not stop_early and len(error_output) <= _CACHE_MAX_INPUT
+        if cacheable:
+            key = _cache_key(error_output)
+            with self._cache_lock:
+                cached = self._cache.get(key)
+            if cached is not None:
+                return replace(
+                    cached,
+                    matched_patterns=list(cached.matched_patterns),
+                    suggestions=list(cached.suggestions),
+                )
+
+        result = self._diagnose(self._matching_patterns(error_output, matchers), stop_early)
+        if cacheable:
+            entry = replace(
+                result,
+                matched_patterns=list(result.matched_patterns),
+                suggestions=list(result.suggestions),
+            )
+            with self._cache_lock:
+                # Skip results computed with matchers replaced in the meantime
+                if self._matchers is matchers:
+                    self._cache[key] = entry
+                    if len(self._cache) > _CACHE_SIZE:
+                        # FIFO eviction keeps the cache bounded
+                        self._cache.popitem(last=False)
+        return result
+
+    def _diagnose(
+        self, matches: Iterable[ErrorPattern], stop_early: bool = False
+    ) -> DiagnosticResult:
+        """Build the diagnostic report from the matching patterns.
+
+        Args:
+            matches: Matching patterns, in registration order.
+            stop_early: See diagnose().
 
         Returns:
             DiagnosticResult with matched patterns and suggestions.
         """
-        matched_patterns = []
-        all_suggestions = []
-        categories = set()
-        severity_level = {"info": 0, "warning": 1, "error": 2}
+        matched: list[ErrorPattern] = []
         max_severity = 0
+        category = "unknown"
+        category_priority = _UNRANKED_CATEGORY + 1  # Worse than any real category
 
-        # Match against all patterns
-        for pattern in self.patterns:
-            if pattern.matches(error_output):
-                matched_patterns.append(pattern.name)
-                categories.add(pattern.category)
-                all_suggestions.extend(pattern.suggestions)
+        for pattern in matches:
+            matched.append(pattern)
+
+            # Track maximum severity and highest-priority category
+            if pattern._severity_int > max_severity:
+                max_severity = pattern._severity_int
+            if pattern._category_priority < category_priority:
+                category_priority = pattern._category_priority
+                category = pattern.category
 
-                # Track maximum severity
-                severity_val = severity_level.get(pattern.severity, 0)
-                if severity_val > max_severity:
-                    max_severity = severity_val
+            # Severity is at its maximum, confidence saturates at 4 matches and
+            # environment is the top-priority category: nothing else can change
+            if stop_early and max_severity == 2 and len(matched) >= 4 and category_priority == 0:
+                break
 
         # Determine severity
-        severity_names = {0: "info", 1: "warning", 2: "error"}
-        severity = severity_names.get(max_severity, "info")
+        severity = _SEVERITY_NAMES[max_severity]
 
         # Calculate confidence based on number of matches
-        confidence = min(1.0, len(matched_patterns) * 0.3)
+        confidence = min(1.0, len(matched) * 0.3)
 
         # Remove duplicate suggestions while preserving order
-        seen = set()
-        unique_suggestions = []
-        for s in all_suggestions:
-            if s not in seen:
-                unique_suggestions.append(s)
-                seen.add(s)
-
-        # Determine category (use most common if multiple)
-        if categories:
-            # Prioritize: environment > build > flash > hardware
-            priority = ["environment", "build", "flash", "hardware", "config"]
-            for cat in priority:
-                if cat in categories:
-                    category = cat
-                    break
-            else:
-                category = list(categories)[0]
-        else:
-            category = "unknown"
+        unique_suggestions = list(dict.fromkeys(s for p in matched for s in p.suggestions))
 
         return DiagnosticResult(
-            matched_patterns=matched_patterns,
+            matched_patterns=[p.name for p in matched],
             category=category,
             suggestions=unique_suggestions,
             severity=severity,
             confidence=confidence,
         )
 
+    def diagnose_parallel(
+        self,
+        error_output: str,
+        context: dict | None = None,
+        workers: int = 4,
+        max_bytes: int | None = MAX_DIAGNOSE_BYTES,
+    ) -> DiagnosticResult:
+        """Analyze error output, searching patterns on several threads.
+
+        Only pays off for large outputs and needs the optional regex module,
+        which releases the GIL while matching (re does not). Otherwise, and
+        for outputs shorter than PARALLEL_MIN_CHARS, this is diagnose().
+
+        Args:
+            error_output: Error text to analyze.
+            context: Optional additional context (command, args, etc).
+            workers: Maximum number of threads (at most _PARALLEL_MAX_WORKERS).
+            max_bytes: See diagnose().
+
+        Returns:
+            DiagnosticResult with matched patterns and suggestions.
+        """
+        if max_bytes is not None and len(error_output) > max_bytes:
+            error_output = error_output[-max_bytes:]
+        if not HAS_REGEX or workers < 2 or len(error_output) <= PARALLEL_MIN_CHARS:
+            return self.diagnose(error_output, context, max_bytes=None)
+        workers = min(workers, _PARALLEL_MAX_WORKERS)
+
+        snapshot = tuple(self.patterns)
+        with self._parallel_lock:
+            built = self._parallel_searchers
+            if built is None or built[0] != snapshot:
+                built = (snapshot, [_parallel_searcher(p) for p in snapshot])
+                self._parallel_searchers = built
+            if self._parallel_pool is None:
+                # Created once and never shut down: other calls may be using it
+                self._parallel_pool = ThreadPoolExecutor(
+                    max_workers=_PARALLEL_MAX_WORKERS, thread_name_prefix="diagnose"
+                )
+            pool = self._parallel_pool
+        patterns, searchers = built
+
+        # Apply the literal prefilter before handing patterns to the pool
+        lowered = error_output.lower() if error_output.isascii() else None
+        jobs = [
+            (i, search)
+            for i, (pattern, search) in enumerate(zip(patterns, searchers, strict=True))
+            if lowered is None
+            or pattern._literals is None
+            or any(literal in lowered for literal in pattern._literals)
+        ]
+        hits: set[int] = set()
+        chunks = [jobs[start::workers] for start in range(min(workers, len(jobs)))]
+        for found in pool.map(_search_chunk, chunks, repeat(error_output)):
+            hits.update(found)
+        return self._diagnose(p for i, p in enumerate(patterns) if i in hits)
+
+    def _sync_matchers(self) -> tuple[tuple[ErrorPattern, ...], Any, frozenset[int]]:
+        """Return the matchers for self.patterns, rebuilding them if it changed.
+
+        Catches add_custom_pattern() as well as direct edits of the list
+        (append, remove, sort). A rebuild is published as one tuple, together
+        with clearing the results cached for the old build, under the cache
+        lock, so concurrent callers see either the old or the new matchers.
+
+        Returns:
+            (patterns snapshot, literal automaton or None, unfiltered indices).
+        """
+        snapshot = tuple(self.patterns)
+        matchers = self._matchers
+        if matchers is not None and matchers[0] == snapshot:
+            return matchers
+
+        matchers = self._build_matchers(snapshot)
+        with self._cache_lock:
+            self._matchers = matchers
+            self._cache.clear()
+        return matchers
+
+    def _build_matchers(
+        self, snapshot: tuple[ErrorPattern, ...]
+    ) -> tuple[tuple[ErrorPattern, ...], Any, frozenset[int]]:
+        """Build the literal automaton for a patterns snapshot.
+
+        Engines whose patterns are exactly the class-level PATTERNS reuse the
+        first such engine's build instead of compiling their own.
+
+        Args:
+            snapshot: tuple(self.patterns) at the time of the build.
+
+        Returns:
+            (snapshot, literal automaton or None, unfiltered indices).
+        """
+        cached = DiagnosticEngine._shared_matchers
+        if cached is not None and cached[0] == snapshot:
+            return cached  # type: ignore[no-any-return]
+
+        matchers = (snapshot, *_build_automaton(snapshot))
+        if snapshot == tuple(self.PATTERNS):
+            DiagnosticEngine._shared_matchers = matchers
+        return matchers
+
+    def _matching_patterns(
+        self,
+        error_output: str,
+        matchers: tuple[tuple[ErrorPattern, ...], Any, frozenset[int]],
+    ) -> Iterator[ErrorPattern]:
+        """Yield the patterns matching error_output, in registration order.
+
+        Patterns are prefiltered by their required literals (through the
+        Aho-Corasick automaton when available) and the remaining ones searched
+        individually. ASCII text is lowercased once and searched without case
+        folding where possible.
+
+        Args:
+            error_output: Error text to match against.
+            matchers: Result of _sync_matchers().
+
+        Returns:
+            Iterator over matching ErrorPattern instances. Patterns are tested
+            lazily, so callers that stop early skip the remaining searches.
+        """
+        patterns, automaton, unfiltered = matchers
+        lowered = error_output.lower() if error_output.isascii() else None
+
+        candidates = None
+        if lowered is not None and automaton is not None:
+            # The automaton rules out every pattern outside candidates
+            candidates = set(unfiltered)
+            for _, indices in automaton.iter(lowered):
+                candidates.update(indices)
+        return self._scan(error_output, lowered, patterns, candidates)
+
+    def _scan(
+        self,
+        error_output: str,
+        lowered: str | None,
+        patterns: tuple[ErrorPattern, ...],
+        candidates: set[int] | None = None,
+    ) -> Iterator[ErrorPattern]:
+        """Search each pattern in turn, in registration order.
+
+        This is ErrorPattern.matches_fast() inlined to save a method call per
+        pattern; keep the two in sync.
+
+        Args:
+            error_output: Error text to match against.
+            lowered: error_output.lower() if error_output is ASCII, else None.
+            patterns: Patterns snapshot the matchers were built for.
+            candidates: If given, only these pattern indices are searched, and
+                the literal prefilter is skipped (the automaton applied it).
+
+        Yields:
+            Matching ErrorPattern instances.
+        """
+        for i, pattern in enumerate(patterns):
+            if candidates is not None:
+                if i not in candidates:
+                    continue
+            elif (
+                lowered is not None
+                and pattern._literals is not None
+                and not any(literal in lowered for literal in pattern._literals)
+            ):
+                continue
+
+            if lowered is not None and pattern._lower_union is not None:
+                if pattern._lower_union.search(lowered) is not None:
+                    yield pattern
+            elif pattern._union is not None:
+                if pattern._union.search(error_output) is not None:
+                    yield pattern
+            elif any(compiled.search(error_output) for compiled in pattern._compiled):
+                yield pattern
+
     def add_custom_pattern(self, pattern: ErrorPattern) -> None:
         """Add custom error pattern.
 
@@ -472,6 +1035,8 @@ class DiagnosticContext:
         env_vars: Environment variables (sanitized).
     """
 
+    __slots__ = ("command", "args", "cwd", "env_vars")
+
     def __init__(
         self,
         command: str,
@@ -510,8 +1075,6 @@ class DiagnosticContext:
         Returns:
             Dictionary with full context.
         """
-        from datetime import datetime
-
         return {
             "timestamp": datetime.now().isoformat(),
             "command": self.command,
@@ -534,25 +1097,10 @@ class DiagnosticContext:
         Returns:
             Sanitized environment dict.
         """
-        # Patterns for sensitive keys
-        sensitive_patterns = [
-            "TOKEN",
-            "PASSWORD",
-            "SECRET",
-            "KEY",
-            "AUTH",
-            "CREDENTIAL",
-        ]
-
-        sanitized = {}
-        for key, value in env.items():
-            # Check if key contains sensitive pattern
-            if any(pattern in key.upper() for pattern in sensitive_patterns):
-                sanitized[key] = "***REDACTED***"
-            else:
-                sanitized[key] = value
-
-        return sanitized
+        return {
+            key: "***REDACTED***" if _SENSITIVE_RE.search(key) else value
+            for key, value in env.items()
+        }
 
     def to_dict(self) -> dict:
         """Convert context to dictionary.
@@ -3,8 +3,11 @@
 Provides formatting utilities for human-readable and AI-parseable output.
 """
 
+import functools
+import sys
 from dataclasses import dataclass
 from datetime import datetime
+from itertools import chain, islice
 
 
 @dataclass
@@ -26,6 +29,61 @@ class ToolResult:
     error: str | None = None
 
 
+@dataclass(frozen=True, slots=True)
+class _Labels:
+    """Constant labels, headers and status glyphs used by OutputFormatter."""
+
+    tool: str
+    status: str
+    duration: str
+    output: str
+    severity: str
+    matched: str
+    suggestions: str
+    metrics_header: str
+    diagnostic_header: str
+    progress_header: str
+    bottlenecks_intro: str
+    success: str
+    failed: str
+    check: str
+    cross: str
+    spin: str
+
+    @classmethod
+    def build(cls, colors: dict[str, str]) -> "_Labels":
+        """Render every label with the given ANSI codes.
+
+        Args:
+            colors: Color name -> escape code; empty codes give plain text.
+
+        Returns:
+            Rendered labels.
+        """
+        bold, reset = colors["bold"], colors["reset"]
+        return cls(
+            tool=f"{bold}Tool:{reset}",
+            status=f"{bold}Status:{reset}",
+            duration=f"{bold}Duration:{reset}",
+            output=f"{bold}Output:{reset}",
+            severity=f"{bold}Severity:{reset}",
+            matched=f"{bold}Matched Patterns:{reset}",
+            suggestions=f"{bold}Suggestions:{reset}",
+            metrics_header=f"{bold}Performance Metrics Summary{reset}",
+            diagnostic_header=f"{bold}Diagnostic Report{reset}",
+            progress_header=f"{bold}Workflow Progress{reset}",
+            bottlenecks_intro=(
+                f"{bold}Performance Bottlenecks{reset}\n{'=' * 60}\n\n"
+                "The following operations are taking the longest:\n"
+            ),
+            success=f"{colors['green']}✓ SUCCESS{reset}",
+            failed=f"{colors['red']}✗ FAILED{reset}",
+            check=f"{colors['green']}✓{reset}",
+            cross=f"{colors['red']}✗{reset}",
+            spin=f"{colors['yellow']}⟳{reset}",
+        )
+
+
 class OutputFormatter:
     """Format output for different audiences (AI vs Human).
 
@@ -67,6 +125,26 @@ class OutputFormatter:
         "reset": "\033[0m",
     }
 
+    _SEP60 = "=" * 60
+    _RESET = COLORS["reset"]
+
+    # Workflow progress bar, sliced to the filled/empty split on each call
+    _BAR_WIDTH = 40
+    _BAR_FULL = "█" * _BAR_WIDTH
+    _BAR_EMPTY = "░" * _BAR_WIDTH
+
+    def __init__(self, use_colors: bool | None = None):
+        """Initialize output formatter.
+
+        Args:
+            use_colors: Emit ANSI color codes. Defaults to whether stdout is a
+                terminal.
+        """
+        if use_colors is None:
+            use_colors = sys.stdout.isatty()
+        self.use_colors = use_colors
+        self._labels = _COLORED_LABELS if use_colors else _PLAIN_LABELS
+
     def format_tool_result(
         self, tool_name: str, result: str, duration: float, success: bool
     ) -> str:
@@ -81,26 +159,24 @@ class OutputFormatter:
         Returns:
             Formatted result string.
         """
-        status = (
-            self._colorize("✓ SUCCESS", "green") if success else self._colorize("✗ FAILED", "red")
+        labels = self._labels
+        status = labels.success if success else labels.failed
+
+        return (
+            f"{labels.tool} {tool_name}\n"
+            f"{labels.status} {status}\n"
+            f"{labels.duration} {duration:.2f}s\n\n"
+            f"{labels.output}\n"
+            f"{result}"
         )
 
-        output = [
-            f"{self._colorize('Tool:', 'bold')} {tool_name}",
-            f"{self._colorize('Status:', 'bold')} {status}",
-            f"{self._colorize('Duration:', 'bold')} {duration:.2f}s",
-            "",
-            f"{self._colorize('Output:', 'bold')}",
-            result,
-        ]
-
-        return "\n".join(output)
-
-    def format_metrics_summary(self, metrics: dict[str, dict]) -> str:
+    def format_metrics_summary(self, metrics: dict[str, dict], *, limit: int | None = None) -> str:
         """Format metrics summary for display.
 
         Args:
             metrics: Dictionary of tool_name -> stats mapping.
+            limit: Format only the first limit tools (in mapping order, so
+                pass metrics pre-sorted for a "top N" view). None formats all.
 
         Returns:
             Formatted metrics summary.
@@ -109,12 +185,12 @@ class OutputFormatter:
             return "No metrics available."
 
         lines = [
-            self._colorize("Performance Metrics Summary", "bold"),
-            "=" * 60,
+            self._labels.metrics_header,
+            self._SEP60,
             "",
         ]
 
-        for tool_name, stats in metrics.items():
+        for tool_name, stats in islice(metrics.items(), limit):
             lines.append(f"{self._colorize(tool_name, 'blue')}")
             lines.append(f"  Calls: {stats.get('call_count', 0)}")
             lines.append(f"  Success Rate: {stats.get('success_rate', 0) * 100:.1f}%")
@@ -143,24 +219,19 @@ class OutputFormatter:
         """
         severity_color = "red" if severity == "error" else "yellow"
 
-        lines = [
-            f"{self._colorize('Diagnostic Report', 'bold')}",
-            "=" * 60,
-            "",
-            f"{self._colorize('Severity:', 'bold')} {self._colorize(severity.upper(), severity_color)}",
-            f"{self._colorize('Matched Patterns:', 'bold')}",
-        ]
-
-        for pattern in matched_patterns:
-            lines.append(f"  - {pattern}")
+        labels = self._labels
+        report = (
+            f"{labels.diagnostic_header}\n{self._SEP60}\n\n"
+            f"{labels.severity} {self._colorize(severity.upper(), severity_color)}\n"
+            f"{labels.matched}" + "".join(f"\n  - {pattern}" for pattern in matched_patterns)
+        )
 
         if suggestions:
-            lines.append("")
-            lines.append(f"{self._colorize('Suggestions:', 'bold')}")
-            for i, suggestion in enumerate(suggestions, 1):
-                lines.append(f"  {i}. {suggestion}")
+            report += f"\n\n{labels.suggestions}" + "".join(
+                f"\n  {i}. {suggestion}" for i, suggestion in enumerate(suggestions, 1)
+            )
 
-        return "\n".join(lines)
+        return report
 
     def format_workflow_progress(self, stages: list[dict], total_stages: int) -> str:
         """Format workflow progress with visual indicators.
@@ -175,19 +246,18 @@ class OutputFormatter:
         completed = sum(1 for s in stages if s.get("status") == "completed")
         progress_percent = (completed / total_stages * 100) if total_stages > 0 else 0
 
+        labels = self._labels
         lines = [
-            self._colorize("Workflow Progress", "bold"),
-            "=" * 60,
+            labels.progress_header,
+            self._SEP60,
             "",
             f"Completed: {completed}/{total_stages} ({progress_percent:.0f}%)",
             "",
         ]
 
         # Progress bar
-        bar_width = 40
-        filled = int(bar_width * progress_percent / 100)
-        bar = "█" * filled + "░" * (bar_width - filled)
-        lines.append(f"[{bar}]")
+        filled = int(self._BAR_WIDTH * progress_percent / 100)
+        lines.append(f"[{self._BAR_FULL[:filled]}{self._BAR_EMPTY[: self._BAR_WIDTH - filled]}]")
         lines.append("")
 
         # Stage list with status indicators
@@ -196,11 +266,11 @@ class OutputFormatter:
             status = stage.get("status", "pending")
 
             if status == "completed":
-                indicator = self._colorize("✓", "green")
+                indicator = labels.check
             elif status == "failed":
-                indicator = self._colorize("✗", "red")
+                indicator = labels.cross
             elif status == "in_progress":
-                indicator = self._colorize("⟳", "yellow")
+                indicator = labels.spin
             else:
                 indicator = "○"
 
@@ -223,23 +293,18 @@ class OutputFormatter:
         if not bottlenecks:
             return "No bottlenecks identified."
 
-        lines = [
-            self._colorize("Performance Bottlenecks", "bold"),
-            "=" * 60,
-            "",
-            "The following operations are taking the longest:",
-            "",
-        ]
-
+        rows = []
         for i, bottleneck in enumerate(bottlenecks, 1):
             tool_name = bottleneck.get("tool_name", "unknown")
             duration = bottleneck.get("avg_duration_ms", 0)
             percentile = bottleneck.get("percentile", 0)
 
-            lines.append(f"{i}. {self._colorize(tool_name, 'yellow')}")
-            lines.append(f"   Avg: {duration:.1f}ms (P{percentile:.0f})")
+            rows.append(
+                f"\n{i}. {self._colorize(tool_name, 'yellow')}"
+                f"\n   Avg: {duration:.1f}ms (P{percentile:.0f})"
+            )
 
-        return "\n".join(lines)
+        return self._labels.bottlenecks_intro + "".join(rows)
 
     def _colorize(self, text: str, color: str) -> str:
         """Apply ANSI color to text.
@@ -249,11 +314,50 @@ class OutputFormatter:
             color: Color name or style.
 
         Returns:
-            Colorized text with reset code.
+            Colorized text with reset code, or text unchanged if colors are
+            disabled.
         """
-        color_code = self.COLORS.get(color, "")
-        reset_code = self.COLORS["reset"]
-        return f"{color_code}{text}{reset_code}"
+        if not self.use_colors:
+            return text
+        return f"{self.COLORS.get(color, '')}{text}{self._RESET}"
+
+
+# OutputFormatter labels with and without ANSI colors, rendered once
+_COLORED_LABELS = _Labels.build(OutputFormatter.COLORS)
+_PLAIN_LABELS = _Labels.build(dict.fromkeys(OutputFormatter.COLORS, ""))
+
+
+@functools.lru_cache(maxsize=4096)
+def _display_time(timestamp: str) -> str | None:
+    """Format an ISO 8601 timestamp for the error history table.
+
+    Cached, since the same history is typically rendered repeatedly.
+
+    Args:
+        timestamp: ISO 8601 timestamp string.
+
+    Returns:
+        "YYYY-MM-DD HH:MM", or None if timestamp cannot be parsed.
+    """
+    try:
+        return datetime.fromisoformat(timestamp).strftime("%Y-%m-%d %H:%M")
+    except Exception:
+        return None
+
+
+def _table_header(columns: tuple[str, ...], col_widths: tuple[int, ...]) -> str:
+    """Build a table's header row and separator line.
+
+    Args:
+        columns: Column titles.
+        col_widths: Column widths, one per title.
+
+    Returns:
+        Header row and separator joined by a newline.
+    """
+    header = "  ".join(f"{col:<{w}}" for col, w in zip(columns, col_widths, strict=True))
+    separator = "-" * sum(col_widths) + "-" * (len(col_widths) - 1) * 2
+    return f"{header}\n{separator}"
 
 
 class TableFormatter:
@@ -271,11 +375,23 @@ class TableFormatter:
         table = formatter.format_tool_stats_table(stats)
     """
 
-    def format_tool_stats_table(self, stats: dict[str, dict]) -> str:
+    # Column widths and prebuilt header blocks for each table
+    _TOOL_WIDTHS = (20, 8, 13, 13, 20)
+    _TOOL_HEADER = _table_header(
+        ("Tool", "Calls", "Success Rate", "Avg Duration", "Last Called"), _TOOL_WIDTHS
+    )
+    _STAGE_WIDTHS = (15, 12, 12, 20)
+    _STAGE_HEADER = _table_header(("Stage", "Status", "Duration", "Last Run"), _STAGE_WIDTHS)
+    _ERROR_WIDTHS = (20, 15, 25, 10)
+    _ERROR_HEADER = _table_header(("Time", "Tool", "Pattern", "Severity"), _ERROR_WIDTHS)
+
+    def format_tool_stats_table(self, stats: dict[str, dict], *, limit: int | None = None) -> str:
         """Format tool statistics as table.
 
         Args:
             stats: Dictionary of tool_name -> stats mapping.
+            limit: Format only the first limit rows (in mapping order). None
+                formats all.
 
         Returns:
             ASCII table of tool statistics.
@@ -283,28 +399,20 @@ class TableFormatter:
         if not stats:
             return "No tool statistics available."
 
-        # Define columns
-        columns = ["Tool", "Calls", "Success Rate", "Avg Duration", "Last Called"]
-        col_widths = [20, 8, 13, 13, 20]
-
-        # Header
-        lines = ["  ".join(col.ljust(w) for col, w in zip(columns, col_widths, strict=True))]
-        lines.append("-" * sum(col_widths) + "-" * (len(col_widths) - 1) * 2)
+        w0, w1, w2, w3, w4 = self._TOOL_WIDTHS
 
-        # Rows
-        for tool_name, tool_stats in stats.items():
-            cells = [
-                tool_name[: col_widths[0]],
-                str(tool_stats.get("call_count", 0)),
-                f"{tool_stats.get('success_rate', 0) * 100:.1f}%",
-                f"{tool_stats.get('avg_duration_ms', 0):.1f}ms",
-                tool_stats.get("last_called", "N/A")[: col_widths[4]],
-            ]
+        def row(tool_name: str, tool_stats: dict) -> str:
+            calls = tool_stats.get("call_count", 0)
+            success_rate = f"{tool_stats.get('success_rate', 0) * 100:.1f}%"
+            duration = f"{tool_stats.get('avg_duration_ms', 0):.1f}ms"
+            last_called = tool_stats.get("last_called", "N/A")[:w4]
+            return (
+                f"{tool_name[:w0]:<{w0}}  {calls!s:<{w1}}  {success_rate:<{w2}}  "
+                f"{duration:<{w3}}  {last_called:<{w4}}"
+            )
 
-            row = "  ".join(cell.ljust(w) for cell, w in zip(cells, col_widths, strict=True))
-            lines.append(row)
-
-        return "\n".join(lines)
+        rows = (row(name, tool_stats) for name, tool_stats in islice(stats.items(), limit))
+        return "\n".join(chain((self._TOOL_HEADER,), rows))
 
     def format_stage_progress_table(self, stages: list[dict]) -> str:
         """Format stage progress as table.
@@ -318,26 +426,16 @@ class TableFormatter:
         if not stages:
             return "No stage information available."
 
-        columns = ["Stage", "Status", "Duration", "Last Run"]
-        col_widths = [15, 12, 12, 20]
+        w0, w1, w2, w3 = self._STAGE_WIDTHS
 
-        # Header
-        lines = ["  ".join(col.ljust(w) for col, w in zip(columns, col_widths, strict=True))]
-        lines.append("-" * sum(col_widths) + "-" * (len(col_widths) - 1) * 2)
+        def row(stage: dict) -> str:
+            name = stage.get("name", "unknown")[:w0]
+            status = stage.get("status", "unknown")[:w1]
+            duration = f"{stage.get('duration', 0):.1f}s"[:w2]
+            last_run = stage.get("last_run", "N/A")[:w3]
+            return f"{name:<{w0}}  {status:<{w1}}  {duration:<{w2}}  {last_run:<{w3}}"
 
-        # Rows
-        for stage in stages:
-            cells = [
-                stage.get("name", "unknown")[: col_widths[0]],
-                stage.get("status", "unknown")[: col_widths[1]],
-                f"{stage.get('duration', 0):.1f}s"[: col_widths[2]],
-                stage.get("last_run", "N/A")[: col_widths[3]],
-            ]
-
-            row = "  ".join(cell.ljust(w) for cell, w in zip(cells, col_widths, strict=True))
-            lines.append(row)
-
-        return "\n".join(lines)
+        return "\n".join(chain((self._STAGE_HEADER,), map(row, stages)))
 
     def format_error_history_table(self, errors: list[dict]) -> str:
         """Format error history as table.
@@ -351,32 +449,17 @@ class TableFormatter:
         if not errors:
             return "No errors recorded."
 
-        columns = ["Time", "Tool", "Pattern", "Severity"]
-        col_widths = [20, 15, 25, 10]
+        w0, w1, w2, w3 = self._ERROR_WIDTHS
 
-        # Header
-        lines = ["  ".join(col.ljust(w) for col, w in zip(columns, col_widths, strict=True))]
-        lines.append("-" * sum(col_widths) + "-" * (len(col_widths) - 1) * 2)
-
-        # Rows
-        for error in errors:
+        def row(error: dict) -> str:
             timestamp = error.get("timestamp", "")
             if timestamp:
                 # Parse ISO timestamp and format nicely
-                try:
-                    dt = datetime.fromisoformat(timestamp)
-                    timestamp = dt.strftime("%Y-%m-%d %H:%M")
-                except Exception:
-                    timestamp = timestamp[: col_widths[0]]
-
-            cells = [
-                timestamp[: col_widths[0]],
-                error.get("tool_name", "unknown")[: col_widths[1]],
-                error.get("pattern", "unknown")[: col_widths[2]],
-                error.get("severity", "unknown")[: col_widths[3]],
-            ]
-
-            row = "  ".join(cell.ljust(w) for cell, w in zip(cells, col_widths, strict=True))
-            lines.append(row)
+                timestamp = _display_time(timestamp) or timestamp[:w0]
 
-        return "\n".join(lines)
+            tool_name = error.get("tool_name", "unknown")[:w1]
+            pattern = error.get("pattern", "unknown")[:w2]
+            severity = error.get("severity", "unknown")[:w3]
+            return f"{timestamp[:w0]:<{w0}}  {tool_name:<{w1}}  {pattern:<{w2}}  {severity:<{w3}}"
+
+        return "\n".join(chain((self._ERROR_HEADER,), map(row, errors)))
@@ -5,13 +5,149 @@ Provides colored console output for humans and JSON logs for AI consumption.
 
 import json
 import logging
+import os
 import re
+import threading
+import time
 from datetime import datetime
 from enum import Enum
 from logging.handlers import RotatingFileHandler
 from pathlib import Path
 from typing import Any
 
+# Optional orjson for faster JSONL serialization
+try:
+    import orjson
+
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
+# Log file write buffer size, and the longest time a buffered record below
+# ERROR may wait before it is flushed to disk
+_LOG_BUFFER_SIZE = 65536
+_LOG_FLUSH_INTERVAL = 1.0
+
+
+# Longest tool result / error output stored in a log record's context, and
+# longest string tool argument
+_MAX_CONTEXT_FIELD = 500
+_MAX_ARG_LENGTH = 1024
+
+# orjson options matching the json.dumps fallback in _dumps() for non-JSON types
+_ORJSON_OPTIONS = (
+    orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_PASSTHROUGH_DATACLASS
+    if HAS_ORJSON
+    else 0
+)
+
+# Shortest ASCII string JSONFormatter sanitizes with str.translate()
+_TRANSLATE_MIN_LENGTH = 160
+
+# Plain level names by level number (record.levelname may carry ANSI codes)
+_LEVEL_NAMES = {
+    logging.DEBUG: "DEBUG",
+    logging.INFO: "INFO",
+    logging.WARNING: "WARNING",
+    logging.ERROR: "ERROR",
+    logging.CRITICAL: "CRITICAL",
+}
+
+# LogRecord attributes that are not user context passed via extra=
+_STANDARD_ATTRS = frozenset(
+    {
+        "name",
+        "msg",
+        "args",
+        "levelname",
+        "levelno",
+        "pathname",
+        "filename",
+        "module",
+        "lineno",
+        "funcName",
+        "created",
+        "msecs",
+        "relativeCreated",
+        "thread",
+        "threadName",
+        "processName",
+        "process",
+        "taskName",  # Python 3.12+
+        "getMessage",
+        "exc_info",
+        "exc_text",
+        "stack_info",
+        "asctime",
+        "message",
+    }
+)
+
+
+def _json_default(obj: Any) -> Any:
+    """Convert a value json cannot serialize: enums by value, anything else via str().
+
+    Args:
+        obj: Value json.dumps could not serialize.
+
+    Returns:
+        JSON-serializable replacement.
+    """
+    if isinstance(obj, Enum):
+        return obj.value
+    return str(obj)
+
+
+def _dumps(entry: dict) -> str:
+    """Serialize a log entry to a single line of compact JSON.
+
+    Uses orjson when installed and json.dumps otherwise; both produce the
+    same line. Separators are compact (no spaces), enums are written by
+    value, and datetimes, dataclasses and other non-JSON values through
+    str(). Falls back to json.dumps for anything orjson rejects (e.g.
+    integers beyond 64 bits).
+
+    Args:
+        entry: Log entry dictionary.
+
+    Returns:
+        JSON string.
+    """
+    if HAS_ORJSON:
+        try:
+            return orjson.dumps(entry, default=str, option=_ORJSON_OPTIONS).decode()
+        except (orjson.JSONEncodeError, TypeError):
+            pass
+    return json.dumps(entry, ensure_ascii=False, separators=(",", ":"), default=_json_default)
+
+
+def _truncate_for_log(text: str | None, limit: int = _MAX_CONTEXT_FIELD) -> str:
+    """Cut text down to what a log record stores.
+
+    Args:
+        text: Text to truncate (None is logged as an empty string).
+        limit: Maximum length.
+
+    Returns:
+        The first limit characters of text.
+    """
+    return text[:limit] if text else ""
+
+
+def _truncate_args(args: dict) -> dict:
+    """Shorten long string values in tool arguments before logging them.
+
+    Args:
+        args: Tool arguments.
+
+    Returns:
+        args itself if no string value exceeds _MAX_ARG_LENGTH, otherwise a
+        shallow copy with those values truncated.
+    """
+    if not any(isinstance(v, str) and len(v) > _MAX_ARG_LENGTH for v in args.values()):
+        return args
+    return {k: v[:_MAX_ARG_LENGTH] if isinstance(v, str) else v for k, v in args.items()}
+
 
 class LogLevel(Enum):
     """Log level enumeration."""
@@ -82,8 +218,44 @@ class JSONFormatter(logging.Formatter):
     - context: Additional metadata from log call
     """
 
-    # Control characters to remove (all except \n, \r, \t)
+    # Control characters to remove (all except \n, \r, \t), as a regex and
+    # as a str.translate() delete table
     _CONTROL_CHARS_PATTERN = re.compile(r"[\x00-\x08\x0b\x0c\x0e-\x1f]")
+    _CONTROL_CHARS_TABLE = dict.fromkeys([*range(0x00, 0x09), 0x0B, 0x0C, *range(0x0E, 0x20)])
+
+    def __init__(self, *args: Any, **kwargs: Any):
+        """Initialize formatter; arguments are those of logging.Formatter."""
+        super().__init__(*args, **kwargs)
+        # (whole second, its ISO 8601 local time) of the last record formatted
+        self._last_second: tuple[int, str] = (-1, "")
+
+    def _format_timestamp(self, created: float) -> str:
+        """Format a record time like datetime.fromtimestamp(created).isoformat().
+
+        The date and time part is cached per whole second, since consecutive
+        records usually share it; only the microseconds are formatted anew.
+
+        Args:
+            created: Record creation time (seconds since the epoch).
+
+        Returns:
+            ISO 8601 local timestamp.
+        """
+        # Round to microseconds the way datetime.fromtimestamp does
+        second = int(created)
+        microsecond = round((created - second) * 1e6)
+        if microsecond >= 1_000_000:
+            second += 1
+            microsecond -= 1_000_000
+        elif microsecond < 0:
+            second -= 1
+            microsecond += 1_000_000
+
+        last_second, prefix = self._last_second
+        if second != last_second:
+            prefix = datetime.fromtimestamp(second).isoformat()
+            self._last_second = (second, prefix)
+        return f"{prefix}.{microsecond:06d}" if microsecond else prefix
 
     @staticmethod
     def _sanitize_string(value: Any) -> Any:
@@ -96,7 +268,14 @@ class JSONFormatter(logging.Formatter):
             Sanitized value safe for JSON encoding.
         """
         if isinstance(value, str):
-            # Remove control characters except \n, \r, \t
+            # Printable strings (most messages) contain no control characters
+            if value.isprintable():
+                return value
+            # Remove control characters except \n, \r, \t. translate() only
+            # beats the regex on longer ASCII strings; it is slower on short
+            # and non-ASCII ones.
+            if len(value) >= _TRANSLATE_MIN_LENGTH and value.isascii():
+                return value.translate(JSONFormatter._CONTROL_CHARS_TABLE)
             return JSONFormatter._CONTROL_CHARS_PATTERN.sub("", value)
         elif isinstance(value, (list, tuple)):
             return type(value)(JSONFormatter._sanitize_string(v) for v in value)
@@ -115,21 +294,14 @@ class JSONFormatter(logging.Formatter):
         """
         # Get the original levelname without ANSI codes
         # Use levelno instead to get the clean level name
-        level_map = {
-            logging.DEBUG: "DEBUG",
-            logging.INFO: "INFO",
-            logging.WARNING: "WARNING",
-            logging.ERROR: "ERROR",
-            logging.CRITICAL: "CRITICAL",
-        }
-        clean_level = level_map.get(record.levelno, record.levelname)
+        clean_level = _LEVEL_NAMES.get(record.levelno, record.levelname)
 
         # Sanitize message to remove control characters
         message = record.getMessage()
         sanitized_message = self._sanitize_string(message)
 
         log_entry = {
-            "timestamp": datetime.fromtimestamp(record.created).isoformat(),
+            "timestamp": self._format_timestamp(record.created),
             "level": clean_level,
             "logger": record.name,
             "message": sanitized_message,
@@ -143,44 +315,118 @@ class JSONFormatter(logging.Formatter):
             exc_text = self.formatException(record.exc_info)
             log_entry["exception"] = self._sanitize_string(exc_text)
 
-        # Add context from extra fields
-        # Look for fields that aren't standard LogRecord attributes
-        standard_attrs = {
-            "name",
-            "msg",
-            "args",
-            "levelname",
-            "levelno",
-            "pathname",
-            "filename",
-            "module",
-            "lineno",
-            "funcName",
-            "created",
-            "msecs",
-            "relativeCreated",
-            "thread",
-            "threadName",
-            "processName",
-            "process",
-            "getMessage",
-            "exc_info",
-            "exc_text",
-            "stack_info",
-            "asctime",
-            "message",
-        }
-        context = {}
-        for key, value in record.__dict__.items():
-            if key not in standard_attrs and not key.startswith("_"):
-                # Sanitize context values
-                context[key] = self._sanitize_string(value)
+        # Add context from extra fields (non-standard LogRecord attributes).
+        # The set difference runs in C and skips the scan for most records.
+        if record.__dict__.keys() - _STANDARD_ATTRS:
+            context = {
+                key: self._sanitize_string(value)
+                for key, value in record.__dict__.items()
+                if key not in _STANDARD_ATTRS and not key.startswith("_")
+            }
+            if context:
+                log_entry["context"] = context
+
+        # Non-serializable objects are logged as str()
+        return _dumps(log_entry)
+
+
+class BufferedRotatingFileHandler(RotatingFileHandler):
+    """Rotating file handler that batches writes instead of flushing per record.
+
+    The file is opened with a large write buffer. A record is flushed right
+    away if it is ERROR or above, or if nothing was flushed for
+    _LOG_FLUSH_INTERVAL seconds; otherwise a background flusher thread
+    flushes it within that interval. The flusher is started on demand, is
+    reused while records keep arriving and exits after an idle interval.
+    The file size is tracked in memory, in encoded bytes, so the rollover
+    check no longer seeks, which would flush the buffer, or formats the
+    record a second time.
+    """
 
-        if context:
-            log_entry["context"] = context
+    def __init__(self, *args: Any, **kwargs: Any):
+        """Initialize handler; arguments are those of RotatingFileHandler."""
+        self._size = 0
+        self._rotatable = True
+        self._last_flush = 0.0
+        self._unflushed = False
+        self._flusher: threading.Thread | None = None
+        self._closing = threading.Event()
+        super().__init__(*args, **kwargs)
+
+    def _open(self):
+        """Open the log file with a large write buffer and record its size."""
+        stream = open(
+            self.baseFilename,
+            self.mode,
+            buffering=_LOG_BUFFER_SIZE,
+            encoding=self.encoding,
+            errors=self.errors,
+        )
+        # See bpo-45401: never roll over anything other than regular files
+        self._rotatable = os.path.isfile(self.baseFilename)
+        self._size = stream.tell()
+        return stream
 
-        # Use default=str to handle non-serializable objects
-        return json.dumps(log_entry, ensure_ascii=False, default=str)
+    def emit(self, record: logging.LogRecord) -> None:
+        """Write a record, rolling over first if it would exceed maxBytes.
+
+        Args:
+            record: Log record to write.
+        """
+        try:
+            msg = self.format(record) + self.terminator
+            if self.stream is None:
+                self.stream = self._open()
+            # maxBytes counts bytes on disk; only non-ASCII text needs encoding
+            size = (
+                len(msg)
+                if msg.isascii()
+                else len(msg.encode(self.stream.encoding, self.stream.errors or "strict"))
+            )
+            if self.maxBytes > 0 and self._rotatable and self._size + size >= self.maxBytes:
+                self.doRollover()
+                if self.stream is None:
+                    self.stream = self._open()
+            self.stream.write(msg)
+            self._size += size
+
+            now = time.monotonic()
+            if record.levelno >= logging.ERROR or now - self._last_flush >= _LOG_FLUSH_INTERVAL:
+                self.stream.flush()
+                self._last_flush = now
+            else:
+                self._unflushed = True
+                if self._flusher is None:
+                    self._flusher = threading.Thread(
+                        target=self._flush_loop, name="log-flusher", daemon=True
+                    )
+                    self._flusher.start()
+        except RecursionError:
+            raise
+        except Exception:
+            self.handleError(record)
+
+    def _flush_loop(self) -> None:
+        """Flush buffered records every interval until idle or closed (flusher thread)."""
+        while not self._closing.wait(_LOG_FLUSH_INTERVAL):
+            with self.lock:
+                if not self._unflushed:
+                    # Nothing written for a whole interval; emit() restarts us
+                    self._flusher = None
+                    return
+                self._unflushed = False
+                if self.stream is not None:
+                    self.stream.flush()
+                    self._last_flush = time.monotonic()
+
+    def close(self) -> None:
+        """Stop the flusher thread, then flush and close the file."""
+        self._closing.set()
+        with self.lock:
+            flusher, self._flusher = self._flusher, None
+        if flusher is not None and flusher is not threading.current_thread():
+            flusher.join()
+        super().close()
 
 
 class MCPLogger:
@@ -269,11 +515,12 @@ class MCPLogger:
         if json_enabled:
             # JSONL structured log
             json_file = self.json_dir / f"{name}.jsonl"
-            json_handler = RotatingFileHandler(
+            json_handler = BufferedRotatingFileHandler(
                 json_file,
                 maxBytes=max_file_size,
                 backupCount=backup_count,
                 encoding="utf-8",
+                delay=True,  # Open on first record, not for never-written loggers
             )
             json_handler.setLevel(logging.DEBUG)
             json_formatter = JSONFormatter()
@@ -282,11 +529,12 @@ class MCPLogger:
 
             # Human-readable log
             text_file = self.log_dir / f"{name}.log"
-            text_handler = RotatingFileHandler(
+            text_handler = BufferedRotatingFileHandler(
                 text_file,
                 maxBytes=max_file_size,
                 backupCount=backup_count,
                 encoding="utf-8",
+                delay=True,
             )
             text_handler.setLevel(logging.INFO)
             text_formatter = logging.Formatter(
@@ -367,6 +615,8 @@ class MCPLogger:
             success: Whether the tool execution succeeded.
         """
         level = logging.INFO if success else logging.ERROR
+        if not self._logger.isEnabledFor(level):
+            return  # Skip building the record context
         status = "SUCCESS" if success else "FAILED"
 
         self._logger.log(
@@ -374,8 +624,8 @@ class MCPLogger:
             f"Tool {status}: {tool_name} ({duration:.2f}s)",
             extra={
                 "tool_name": tool_name,
-                "tool_args": args,
-                "tool_result": result[:500] if result else "",  # Truncate long results
+                "tool_args": _truncate_args(args),
+                "tool_result": _truncate_for_log(result),
                 "duration_seconds": duration,
                 "success": success,
                 "event_type": "tool_call",
@@ -429,7 +679,7 @@ class MCPLogger:
         self._logger.error(
             f"Error diagnosis: {len(patterns_matched)} patterns matched, {len(suggestions)} suggestions",
             extra={
-                "error_output": error_output[:500],  # Truncate
+                "error_output": _truncate_for_log(error_output),
                 "patterns_matched": patterns_matched,
                 "suggestions": suggestions,
                 "severity": severity,
@@ -437,6 +687,21 @@ class MCPLogger:
             },
         )
 
+    def enabled_for(self, level: int) -> bool:
+        """Check whether a record at level would be processed.
+
+        Callers building costly context (large payloads, formatted reports)
+        should check this first, e.g.
+        ``if logger.enabled_for(logging.DEBUG): logger.debug(...)``.
+
+        Args:
+            level: Logging level (e.g. logging.DEBUG).
+
+        Returns:
+            True if a record at that level would be handled.
+        """
+        return self._logger.isEnabledFor(level)
+
     @property
     def logger(self) -> logging.Logger:
         """Get the underlying Python logger."""
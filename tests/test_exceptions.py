@@ -171,6 +171,15 @@ class TestErrorDescriptions:
         description = get_error_description(error)
         assert "unknown" in description.lower()
 
+    def test_subclass_inherits_description(self):
+        """Test undeclared subclasses fall back to their parent's description."""
+
+        class CustomFlashError(FlashError):
+            pass
+
+        error = CustomFlashError("Write failed")
+        assert get_error_description(error) == get_error_description(FlashError("x"))
+
 
 class TestErrorSuggestions:
     """Test error suggestion generation."""
@@ -4,14 +4,21 @@ Tests the logger, metrics, and diagnostics modules.
 """
 
 import json
+import logging
+import re
 import tempfile
+import threading
+from datetime import datetime
+from enum import Enum
 from pathlib import Path
 
 import pytest
 
 from observability import get_diagnostics, get_logger, get_metrics, reset
-from observability.diagnostics import ErrorPattern
+from observability import logger as logger_module
+from observability.diagnostics import DiagnosticEngine, ErrorPattern
 from observability.formatters import OutputFormatter, TableFormatter
+from observability.logger import HAS_ORJSON, BufferedRotatingFileHandler
 
 
 @pytest.fixture(autouse=True)
@@ -48,6 +55,21 @@ class TestMCPLogger:
             assert logger.log_dir.exists()
             assert logger.json_dir.exists()
 
+    def test_logger_opens_files_on_first_record(self):
+        """Test log files are not created until something is logged."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            log_dir = Path(tmpdir) / "logs"
+            logger = get_logger("lazy", log_dir)
+            json_file = logger.json_dir / "lazy.jsonl"
+
+            assert not json_file.exists()
+            assert not (log_dir / "lazy.log").exists()
+
+            logger.error("First record")
+
+            assert json_file.exists()
+            assert (log_dir / "lazy.log").exists()
+
     def test_logger_info_level(self):
         """Test INFO level logging."""
         with tempfile.TemporaryDirectory() as tmpdir:
@@ -135,6 +157,98 @@ class TestMCPLogger:
                 assert context.get("to_status") == "completed"
                 assert context.get("duration") == 5.2
 
+    @pytest.mark.parametrize(
+        "use_orjson",
+        [
+            False,
+            pytest.param(
+                True, marks=pytest.mark.skipif(not HAS_ORJSON, reason="orjson not installed")
+            ),
+        ],
+    )
+    def test_jsonl_line_shape(self, monkeypatch, use_orjson):
+        """Test JSONL entries serialize identically with and without orjson."""
+        monkeypatch.setattr(logger_module, "HAS_ORJSON", use_orjson)
+        entry = {
+            "message": "done é",
+            "level": logging.INFO,
+            "context": {
+                "status": Enum("Status", {"COMPLETED": "completed"}).COMPLETED,
+                "at": datetime(2024, 1, 2, 3, 4, 5),
+                "path": Path("/tmp/build"),
+                1: [1.5, None, True],
+            },
+        }
+
+        assert logger_module._dumps(entry) == (
+            '{"message":"done é","level":20,"context":{"status":"completed",'
+            '"at":"2024-01-02 03:04:05","path":"/tmp/build","1":[1.5,null,true]}}'
+        )
+
+    def test_buffered_handler_flushes_and_rotates(self):
+        """Test buffered file handler keeps every record and still rotates."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            log_file = Path(tmpdir) / "buffered.log"
+            handler = BufferedRotatingFileHandler(log_file, maxBytes=1000, backupCount=1)
+            record_logger = logging.getLogger("test_buffered_handler")
+            record_logger.addHandler(handler)
+            record_logger.propagate = False
+            try:
+                record_logger.warning("first")
+                assert log_file.read_text() == "first\n"  # First record is not held back
+
+                for i in range(150):
+                    record_logger.warning("record %03d", i)
+            finally:
+                record_logger.removeHandler(handler)
+                handler.close()
+
+            rotated = Path(f"{log_file}.1").read_text()
+            assert "record 149\n" in log_file.read_text()
+            assert rotated and len(rotated) < 1000
+
+    def test_buffered_handler_counts_bytes(self):
+        """Test non-ASCII records rotate before the file exceeds maxBytes."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            log_file = Path(tmpdir) / "bytes.log"
+            handler = BufferedRotatingFileHandler(
+                log_file, maxBytes=1000, backupCount=2, encoding="utf-8"
+            )
+            record_logger = logging.getLogger("test_buffered_bytes")
+            record_logger.addHandler(handler)
+            record_logger.propagate = False
+            try:
+                for i in range(60):
+                    record_logger.warning("串口输出 %03d", i)  # 3 bytes per CJK character
+            finally:
+                record_logger.removeHandler(handler)
+                handler.close()
+
+            assert log_file.stat().st_size < 1000
+            assert Path(f"{log_file}.1").stat().st_size < 1000
+
+    def test_buffered_handler_uses_one_flusher_thread(self):
+        """Test deferred records share one flusher thread that flushes them."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            log_file = Path(tmpdir) / "flusher.log"
+            handler = BufferedRotatingFileHandler(log_file)
+            record_logger = logging.getLogger("test_flusher_thread")
+            record_logger.addHandler(handler)
+            record_logger.propagate = False
+            try:
+                record_logger.warning("first")
+                flushers = set()
+                for i in range(50):
+                    record_logger.warning("deferred %d", i)
+                    flushers.add(handler._flusher)
+
+                assert len(flushers) == 1 and None not in flushers
+                flushers.pop().join(timeout=5)  # Exits once the buffer stays empty
+                assert "deferred 49\n" in log_file.read_text()
+            finally:
+                record_logger.removeHandler(handler)
+                handler.close()
+
 
 # ============================================================================
 # Test Metrics
@@ -318,6 +432,205 @@ class TestDiagnosticEngine:
         result = diagnostics.diagnose("Custom error pattern")
         assert "custom_error" in result.matched_patterns
 
+    def test_custom_pattern_stays_per_engine(self):
+        """Test custom patterns do not leak into other engines."""
+        builtin_count = len(DiagnosticEngine.PATTERNS)
+        custom = DiagnosticEngine(
+            custom_patterns=[
+                ErrorPattern(
+                    name="engine_local",
+                    patterns=[r"engine local error"],
+                    category="custom",
+                    suggestions=["Local fix"],
+                )
+            ]
+        )
+        plain = DiagnosticEngine()
+
+        assert "engine_local" in custom.diagnose("engine local error").matched_patterns
+        assert plain.diagnose("engine local error").matched_patterns == []
+        assert len(DiagnosticEngine.PATTERNS) == builtin_count
+
+    def test_diagnose_cache_is_bounded(self):
+        """Test cached results are keyed by digest and evicted oldest first."""
+        engine = DiagnosticEngine()
+        first = engine.diagnose("IDF_PATH not set")
+
+        for i in range(300):
+            engine.diagnose(f"unrelated output {i}")
+
+        assert len(engine._cache) == 256
+        assert all(isinstance(key, bytes) for key in engine._cache)
+        assert engine.diagnose("IDF_PATH not set") == first
+
+    def test_concurrent_diagnose_during_pattern_changes(self):
+        """Test diagnose stays consistent while another thread adds patterns."""
+        engine = DiagnosticEngine()
+        errors = []
+
+        def diagnose_loop():
+            try:
+                for _ in range(200):
+                    result = engine.diagnose("IDF_PATH not set")
+                    assert result.matched_patterns[0] == "idf_path_not_set"
+            except Exception as e:  # Reported by the main thread
+                errors.append(e)
+
+        threads = [threading.Thread(target=diagnose_loop) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for i in range(50):
+            engine.add_custom_pattern(
+                ErrorPattern(
+                    name=f"concurrent_{i}",
+                    patterns=[rf"concurrent error {i}\b"],
+                    category="custom",
+                    suggestions=["Concurrent fix"],
+                )
+            )
+        for thread in threads:
+            thread.join()
+
+        assert errors == []
+        assert engine.diagnose("concurrent error 49").matched_patterns == ["concurrent_49"]
+
+    def test_direct_pattern_edits_are_picked_up(self):
+        """Test editing engine.patterns in place rebuilds that engine only."""
+        edited = DiagnosticEngine()
+        plain = DiagnosticEngine()
+        assert edited.diagnose("in place error").matched_patterns == []
+
+        edited.patterns.append(
+            ErrorPattern(
+                name="in_place",
+                patterns=[r"in place error"],
+                category="custom",
+                suggestions=["In-place fix"],
+            )
+        )
+
+        assert edited.diagnose("in place error").matched_patterns == ["in_place"]
+        assert plain.diagnose("in place error").matched_patterns == []
+        assert all(p.name != "in_place" for p in DiagnosticEngine.PATTERNS)
+
+    def test_literal_prefilter_keeps_matches(self):
+        """Test substring prefilter does not hide case-insensitive matches."""
+        pattern = ErrorPattern(
+            name="prefilter",
+            patterns=[r"Flash size mismatch", r"detected size.*not matching"],
+            category="flash",
+            suggestions=["Fix flash size"],
+        )
+
+        assert pattern.matches_fast(
+            "DETECTED SIZE is not matching", "detected size is not matching"
+        )
+        assert not pattern.matches_fast("all good", "all good")
+        # Non-ASCII input skips the prefilter and falls back to the regex
+        assert pattern.matches_fast("flash size mismatch ✗", None)
+
+    def test_diagnose_uses_output_tail(self):
+        """Test diagnose only analyses the tail of very long output."""
+        diagnostics = get_diagnostics()
+        filler = "compiling...\n" * 10000
+
+        tail_error = diagnostics.diagnose(filler + "region IRAM overflow", max_bytes=1024)
+        head_error = diagnostics.diagnose("region IRAM overflow\n" + filler, max_bytes=1024)
+        untruncated = diagnostics.diagnose("region IRAM overflow\n" + filler, max_bytes=None)
+
+        assert "memory_overflow" in tail_error.matched_patterns
+        assert head_error.matched_patterns == []
+        assert "memory_overflow" in untruncated.matched_patterns
+
+    def test_diagnose_wildcard_patterns(self):
+        """Test patterns with a wildcard between literals still match."""
+        diagnostics = get_diagnostics()
+
+        cases = {
+            "Python 2.7 is too old": "python_version_mismatch",
+            "detected size 4MB not matching header": "flash_size_mismatch",
+            "could not open port /dev/ttyUSB0: access denied": "port_permission_denied",
+            "region dram0_0_seg overflowed by 12 bytes": "memory_overflow",
+        }
+        for text, expected in cases.items():
+            assert expected in diagnostics.diagnose(text).matched_patterns, text
+
+    def test_case_sensitive_pattern(self):
+        """Test case_sensitive patterns skip case folding, others keep it."""
+        diagnostics = get_diagnostics()
+        diagnostics.add_custom_pattern(
+            ErrorPattern(
+                name="exact_case",
+                patterns=[r"\bE \(\d+\)"],
+                category="custom",
+                suggestions=["Check the log tag"],
+                case_sensitive=True,
+            )
+        )
+
+        assert "exact_case" in diagnostics.diagnose("E (123) boot: error").matched_patterns
+        assert "exact_case" not in diagnostics.diagnose("e (123) boot").matched_patterns
+        assert "memory_overflow" in diagnostics.diagnose("REGION IRAM OVERFLOW").matched_patterns
+        assert "memory_overflow" in diagnostics.diagnose("Region iram Overflow ✗").matched_patterns
+
+    def test_diagnose_parallel_matches_serial(self):
+        """Test diagnose_parallel agrees with diagnose on large output."""
+        diagnostics = get_diagnostics()
+        output = "compiling main.c\n" * 5000 + "region IRAM overflow\nld returned 1\n"
+
+        parallel = diagnostics.diagnose_parallel(output, workers=2)
+
+        assert parallel == diagnostics.diagnose(output)
+        assert "memory_overflow" in parallel.matched_patterns
+
+    def test_diagnose_parallel_reuses_pool_and_tracks_patterns(self):
+        """Test diagnose_parallel keeps its pool and sees newly added patterns."""
+        engine = DiagnosticEngine()
+        output = "compiling main.c\n" * 5000 + "parallel custom failure\n"
+
+        assert engine.diagnose_parallel(output, workers=2).matched_patterns == []
+        pool = engine._parallel_pool
+
+        engine.add_custom_pattern(
+            ErrorPattern(
+                name="parallel_custom",
+                patterns=[r"parallel custom failure"],
+                category="custom",
+                suggestions=["Custom fix"],
+            )
+        )
+
+        result = engine.diagnose_parallel(output, workers=16)
+        assert result.matched_patterns == ["parallel_custom"]
+        assert engine._parallel_pool is pool
+
+    @pytest.mark.parametrize("pattern", DiagnosticEngine.PATTERNS, ids=lambda p: p.name)
+    def test_pattern_matches_like_re_search(self, pattern):
+        """Test each built-in pattern matches exactly where re.search does."""
+        engine = DiagnosticEngine()
+        flags = 0 if pattern.case_sensitive else re.IGNORECASE
+
+        texts = ["", "all good", "x" * 300, "error: something else\n"]
+        for regex_source in pattern.patterns:
+            for filler in ("", " was ", "\n", " 12345 "):
+                sample = re.sub(r"\\(.)", r"\1", regex_source.replace(".*", filler))
+                texts += [
+                    sample,
+                    sample.upper(),
+                    sample.swapcase(),
+                    f"prefix{sample}suffix",
+                    f"line one\n  {sample}\r\nline three",
+                    sample[:-1],
+                ]
+
+        for text in texts:
+            expected = any(re.search(p, text, flags) for p in pattern.patterns)
+            lowered = text.lower() if text.isascii() else None
+            result = engine.diagnose(text)
+            assert (pattern.name in result.matched_patterns) == expected, repr(text)
+            assert pattern.matches(text) == expected, repr(text)
+            assert pattern.matches_fast(text, lowered) == expected, repr(text)
+
     def test_get_suggestions_for_error(self):
         """Test getting suggestions for error."""
         diagnostics = get_diagnostics()
@@ -409,6 +722,29 @@ class TestOutputFormatter:
         assert "Performance Bottlenecks" in output
         assert "esp_flash" in output
 
+    def test_format_metrics_summary_limit(self):
+        """Test limit formats only the first N tools."""
+        formatter = OutputFormatter(use_colors=False)
+        metrics = {f"tool_{i}": {"call_count": i} for i in range(5)}
+
+        output = formatter.format_metrics_summary(metrics, limit=2)
+
+        assert "tool_0" in output and "tool_1" in output
+        assert "tool_2" not in output
+
+    def test_format_without_colors(self):
+        """Test use_colors=False drops every ANSI escape sequence."""
+        formatter = OutputFormatter(use_colors=False)
+
+        output = formatter.format_tool_result("esp_build", "Build succeeded", 5.2, False)
+        progress = formatter.format_workflow_progress(
+            [{"name": "build", "status": "completed"}, {"name": "flash", "status": "failed"}], 2
+        )
+
+        assert "\033[" not in output + progress
+        assert output.startswith("Tool: esp_build\nStatus: ✗ FAILED")
+        assert "✓ build" in progress
+
 
 class TestTableFormatter:
     """Test TableFormatter for tabular data."""
@@ -1,10 +1,13 @@
 """Unit tests for security and resource limit features."""
 
+import dataclasses
+import sys
+
 import pytest
 
 from config import ResourceLimits, SecurityConfig, ToolTimeouts, get_default_config
 from config.permissions import Operation, OperationWhitelist, PathRule
-from mcp_tools.base import ResourceMonitor
+from mcp_tools.base import ResourceMonitor, _run_streaming
 
 
 class TestResourceLimits:
@@ -71,6 +74,16 @@ class TestToolTimeouts:
         assert timeouts.get_timeout("flash") == 600
         assert timeouts.get_timeout("monitor") == 1200
 
+    def test_timeouts_are_immutable(self):
+        """Test timeouts cannot drift from the lookup table after construction."""
+        timeouts = ToolTimeouts()
+        with pytest.raises(dataclasses.FrozenInstanceError):
+            timeouts.build = 30  # type: ignore[misc]
+
+        changed = dataclasses.replace(timeouts, build=30)
+        assert changed.get_timeout("esp_build") == 30
+        assert timeouts.get_timeout("esp_build") == 600
+
 
 class TestSecurityConfig:
     """Test SecurityConfig configuration."""
@@ -200,6 +213,25 @@ class TestResourceMonitor:
         monitor.check_limits("test_tool")
 
 
+class TestRunStreaming:
+    """Test bounded subprocess output capture."""
+
+    def test_stdout_and_stderr_are_bounded(self, tmp_path):
+        """Test only the last lines of each stream are kept."""
+        script = (
+            "import sys\n"
+            "for i in range(2500):\n"
+            "    print(i)\n"
+            "    print('err', i, file=sys.stderr)\n"
+        )
+        result = _run_streaming([sys.executable, "-c", script], cwd=tmp_path, timeout=30)
+
+        assert result.returncode == 0
+        assert result.stdout.startswith("... (500 earlier lines omitted)\n500\n")
+        assert result.stderr.startswith("... (500 earlier lines omitted)\nerr 500\n")
+        assert result.stderr.endswith("err 2499\n")
+
+
 class TestPathRule:
     """Test PathRule dataclass."""
 
@@ -160,6 +160,31 @@ class TestFileStateManager:
         assert retrieved.success is True
         assert retrieved.exit_code == 0
 
+    def test_get_all_stage_statuses(self, temp_project):
+        """Test reading every stage status in one call"""
+        manager = FileStateManager(temp_project)
+
+        for stage, success in (("build", True), ("flash", False)):
+            manager.save_stage_output(
+                StageOutput(
+                    stage=stage,
+                    timestamp="2024-01-01T00:00:00",
+                    success=success,
+                    command=f"idf.py {stage}",
+                    stdout="",
+                    stderr="",
+                    exit_code=0 if success else 1,
+                    duration_seconds=1.0,
+                )
+            )
+        # Stage directory without a status file is skipped
+        manager.get_stage_dir("monitor")
+
+        statuses = manager.get_all_stage_statuses()
+        assert set(statuses) == {"build", "flash"}
+        assert statuses["build"].success is True
+        assert statuses["flash"].exit_code == 1
+
     def test_get_workflow_state(self, temp_project):
         """Test getting workflow state"""
         manager = FileStateManager(temp_project)
@@ -9,6 +9,7 @@ File operations use atomic writes to prevent data corruption.
 """
 
 import json
+import os
 import subprocess
 import tempfile
 from dataclasses import dataclass, field
@@ -296,6 +297,29 @@ class FileStateManager:
         except Exception:
             return None
 
+    def get_all_stage_statuses(self) -> dict[str, StageOutput]:
+        """Read the status files of every executed stage in one directory scan.
+
+        Returns:
+            Mapping of stage name to StageOutput for stages with a readable
+            status file.
+        """
+        statuses: dict[str, StageOutput] = {}
+        try:
+            entries = list(os.scandir(self.stages_dir))
+        except OSError:
+            return statuses
+
+        for entry in entries:
+            if not entry.is_dir():
+                continue
+            try:
+                data = json.loads(Path(entry.path, "status.json").read_text())
+                statuses[entry.name] = StageOutput.from_dict(data)
+            except Exception:
+                continue
+        return statuses
+
     def _update_workflow_state(self, stage_output: StageOutput):
         """Update overall workflow state.
 
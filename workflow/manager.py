@@ -263,6 +263,16 @@ class Workflow:
             return None
         return self.file_manager.get_stage_status(stage_name)
 
+    def get_all_stage_outputs(self) -> dict[str, StageOutput]:
+        """Get outputs of all executed stages from files.
+
+        Returns:
+            Mapping of stage name to StageOutput (empty if file state is disabled).
+        """
+        if not self.file_manager:
+            return {}
+        return self.file_manager.get_all_stage_statuses()
+
     def get_stage_log(self, stage_name: str) -> str | None:
         """Get raw stage output log.
 